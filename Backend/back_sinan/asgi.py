@@ -14,3 +14,15 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'back_sinan.settings')
 
 application = get_asgi_application()
+
+from django.conf import settings
+
+if not settings.DEBUG:
+    # Import every URLconf/view and build the resolver's lookup tables now, so a
+    # worker's first request doesn't pay for it (and a preloading server builds
+    # them once before forking)
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    resolver.reverse_dict
+    resolver.namespace_dict
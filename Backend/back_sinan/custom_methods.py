@@ -1,3 +1,4 @@
+from django.db import IntegrityError
 from rest_framework.permissions import BasePermission
 from rest_framework.views import exception_handler
 from .utils import decodeJWT
@@ -21,12 +22,33 @@ class isAuthenticatedCustom(BasePermission):
         request.user=user
         return True
     
+# Unique constraints whose violation means "this record already exists"
+UNIQUE_CONSTRAINT_NAMES=("uniq_product_code_lower","uniq_account_name_lower")
+
+def is_unique_violation(exc):
+    """True if an IntegrityError came from a unique constraint rather than a CHECK/NOT NULL/FK one"""
+    # Postgres drivers report SQLSTATE 23505 for unique violations
+    sqlstate=getattr(exc.__cause__,"pgcode",None) or getattr(exc.__cause__,"sqlstate",None)
+    if sqlstate:
+        return sqlstate=="23505"
+    message=str(exc)
+    # SQLite ("UNIQUE constraint failed") and MySQL ("Duplicate entry")
+    return ("UNIQUE constraint failed" in message or "Duplicate entry" in message
+            or any(name in message for name in UNIQUE_CONSTRAINT_NAMES))
+
 def custom_exception_handler(exc,context):
     response=exception_handler(exc,context)
 
     if response is not None:
         return response
     
+    # A constraint caught a write the serializer's validators let through
+    # (e.g. two concurrent creates with the same code)
+    if isinstance(exc, IntegrityError):
+        if is_unique_violation(exc):
+            return Response({"error":"A record with these values already exists."},status=409)
+        return Response({"error":"Invalid data: the record violates a database constraint."},status=400)
+    
     exc_list=str(exc).split("Detail:")
     
     return Response({"error":exc_list[-1]},status=403)
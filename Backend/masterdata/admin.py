@@ -1,16 +1,30 @@
-from django.contrib import admin
-from .models import Product, Account
+from django.contrib import admin, messages
+from .models import Product, Account, TrackingDeadLetter
+from .tracking_service import requeue_dead_letters
 
 # Register your models here.
 
+def _is_changelist(request):
+    """Narrow column loading to the changelist; the change form needs every field"""
+    match = getattr(request, 'resolver_match', None)
+    return bool(match and match.url_name and match.url_name.endswith('_changelist'))
+
+
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
     list_display = ('name', 'code', 'sku_uom', 'sku_buy_cost', 'sku_price', 'color', 'created_at')
     list_filter = ('sku_uom', 'color', 'created_at')
-    search_fields = ('name', 'code', 'sku_description')
+    search_fields = ('^name', '=code', 'sku_description')
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('name',)
 
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if _is_changelist(request):
+            # The changelist only renders list_display; skip image/description columns
+            queryset = queryset.only(*self.list_display)
+        return queryset
+
 
 @admin.register(Account)
 class AccountAdmin(admin.ModelAdmin):
@@ -19,3 +33,26 @@ class AccountAdmin(admin.ModelAdmin):
     search_fields = ('account_name',)
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('account_name',)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if _is_changelist(request):
+            queryset = queryset.only(*self.list_display)
+        return queryset
+
+
+@admin.register(TrackingDeadLetter)
+class TrackingDeadLetterAdmin(admin.ModelAdmin):
+    list_display = ('packing_slip', 'courier_code', 'error', 'attempts', 'last_attempted_at')
+    list_filter = ('courier_code', 'last_attempted_at')
+    list_select_related = ('packing_slip',)
+    readonly_fields = ('last_attempted_at',)
+    actions = ('requeue_selected',)
+
+    @admin.action(description='Re-queue selected orders for a tracking update')
+    def requeue_selected(self, request, queryset):
+        result = requeue_dead_letters(queryset)
+        if result['success']:
+            self.message_user(request, result['message'], messages.SUCCESS)
+        else:
+            self.message_user(request, f"Re-queue failed: {result['error']}", messages.ERROR)
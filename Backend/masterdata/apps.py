@@ -3,6 +3,33 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# How long the auto-start thread waits for the database/broker to answer
+Q2_READY_TIMEOUT = 10  # seconds
+Q2_READY_POLL_INTERVAL = 0.1  # seconds
+
+
+def wait_for_q2_ready(timeout=Q2_READY_TIMEOUT):
+    """
+    Poll until the default database and the Django Q2 broker respond.
+    Returns as soon as both are reachable, or False once the timeout expires.
+    """
+    import time
+    from django.db import connections
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with connections['default'].cursor() as cursor:
+                cursor.execute("SELECT 1")
+            from django_q.brokers import get_broker
+            if get_broker().ping():
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(Q2_READY_POLL_INTERVAL)
+
 
 class MasterdataConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
@@ -16,35 +43,52 @@ class MasterdataConfig(AppConfig):
         # Only auto-start if we're running the qcluster command
         import sys
         
-        # Check if this is the qcluster process
-        if 'qcluster' in sys.argv:
-            try:
-                # Import here to avoid circular imports
-                from masterdata.tracking_service import auto_start_tracking_scheduler
-                
-                # Small delay to ensure Django Q2 is fully initialized
-                import threading
-                import time
-                
-                def delayed_start():
-                    time.sleep(2)  # Wait 2 seconds for Q2 to initialize
-                    try:
-                        result = auto_start_tracking_scheduler()
-                        if result.get('success'):
-                            if result.get('auto_started'):
-                                logger.info("🚀 Tracking scheduler auto-started with qcluster!")
-                            else:
-                                logger.info("📋 Tracking scheduler was already running")
+        # Bail out early for every other command (runserver, migrate, test, ...),
+        # for `qcluster --help`, and in the cluster's spawned child processes
+        if len(sys.argv) < 2 or sys.argv[1] != 'qcluster':
+            return
+        if '--help' in sys.argv or '-h' in sys.argv or 'help' in sys.argv:
+            return
+        
+        import multiprocessing
+        if multiprocessing.current_process().name != 'MainProcess':
+            return
+        
+        import importlib.util
+
+        # Skip the tracking service import graph entirely if Django Q2 is missing
+        if importlib.util.find_spec('django_q') is None:
+            logger.warning("Django Q2 not available - skipping auto-start of tracking scheduler")
+            return
+
+        try:
+            import threading
+            
+            def delayed_start():
+                # Start as soon as the database and broker answer instead of a fixed delay
+                if not wait_for_q2_ready():
+                    logger.warning("Django Q2 broker not ready - attempting scheduler auto-start anyway")
+                try:
+                    # Import once Q2 is up so its own imports finish first
+                    # (and to avoid circular imports)
+                    from masterdata.tracking_service import auto_start_tracking_scheduler
+
+                    result = auto_start_tracking_scheduler()
+                    if result.get('success'):
+                        if result.get('auto_started'):
+                            logger.info("🚀 Tracking scheduler auto-started with qcluster!")
                         else:
-                            logger.error(f"❌ Failed to auto-start scheduler: {result.get('error')}")
-                    except Exception as e:
-                        logger.error(f"❌ Error auto-starting scheduler: {str(e)}")
-                
-                # Start in background thread to avoid blocking Django startup
-                threading.Thread(target=delayed_start, daemon=True).start()
-                
-            except ImportError:
-                # Django Q2 not available, skip auto-start
-                logger.warning("Django Q2 not available - skipping auto-start of tracking scheduler")
-            except Exception as e:
-                logger.error(f"Error setting up auto-start for tracking scheduler: {str(e)}")
+                            logger.info("📋 Tracking scheduler was already running")
+                    else:
+                        logger.error(f"❌ Failed to auto-start scheduler: {result.get('error')}")
+                except Exception as e:
+                    logger.error(f"❌ Error auto-starting scheduler: {str(e)}")
+                finally:
+                    from django.db import connection
+                    connection.close()
+            
+            # Start in background thread to avoid blocking Django startup
+            threading.Thread(target=delayed_start, daemon=True).start()
+            
+        except Exception as e:
+            logger.error(f"Error setting up auto-start for tracking scheduler: {str(e)}")
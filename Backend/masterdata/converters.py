@@ -0,0 +1,13 @@
+class DriveFileIdConverter:
+    """
+    A Google Drive file ID: URL-safe base64 characters, matching what the
+    frontend's extractFileIdFromUrl accepts. Anything else 404s in the resolver
+    instead of costing a Drive API call
+    """
+    regex = '[A-Za-z0-9_-]{10,80}'
+
+    def to_python(self, value):
+        return value
+
+    def to_url(self, value):
+        return value
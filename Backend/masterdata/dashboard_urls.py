@@ -0,0 +1,13 @@
+from django.urls import path
+from .views import (
+    DashboardKPIView,
+    DashboardCustomerProfitAnalysisView,
+    DashboardSKUAnalysisView
+)
+
+# Included under dashboard/ through cached_include, so keep these GET-only
+urlpatterns = [
+    path('kpis/', DashboardKPIView.as_view(), name='dashboard-kpis'),
+    path('customer-profit-analysis/', DashboardCustomerProfitAnalysisView.as_view(), name='dashboard-customer-profit-analysis'),
+    path('sku-analysis/', DashboardSKUAnalysisView.as_view(), name='dashboard-sku-analysis'),
+]
@@ -0,0 +1,19 @@
+from django.urls import path
+from .views import (
+    EMBHubDriveAccountsView,
+    EMBHubFolderTreeView,
+    EMBHubFolderView,
+    EMBHubFileView,
+    EMBHubSearchView,
+    EMBHubRunAutomationView
+)
+
+# Included under emb-hub/
+urlpatterns = [
+    path('accounts/', EMBHubDriveAccountsView.as_view(), name='emb-hub-accounts'),
+    path('tree/', EMBHubFolderTreeView.as_view(), name='emb-hub-folder-tree'),
+    path('folders/', EMBHubFolderView.as_view(), name='emb-hub-folders'),
+    path('files/', EMBHubFileView.as_view(), name='emb-hub-files'),
+    path('search/', EMBHubSearchView.as_view(), name='emb-hub-search'),
+    path('run-automation/', EMBHubRunAutomationView.as_view(), name='emb-hub-run-automation'),
+]
@@ -0,0 +1,52 @@
+from django.core import exceptions
+from django.db import models
+
+
+class CompactChoiceField(models.PositiveSmallIntegerField):
+    """
+    Stores one of a fixed set of string choice codes as a small integer
+    (a 2-byte column) while Python code, querysets, serializers and the admin
+    keep working with the string codes.
+
+    The stored integer is the code's position in ``choices`` plus one; 0 holds
+    the blank value ''. Only ever append to ``choices`` - reordering or
+    removing an entry changes the meaning of existing rows.
+    """
+
+    description = "Choice code stored as a small integer"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._code_to_int = {'': 0}
+        self._code_to_int.update({code: i for i, (code, _) in enumerate(self.choices or [], start=1)})
+        self._int_to_code = {i: code for code, i in self._code_to_int.items()}
+
+    @property
+    def validators(self):
+        # Values are string codes in Python; the integer range validators don't apply
+        return list(self._validators)
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return self._int_to_code.get(value, value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        if value in self._int_to_code:
+            return self._int_to_code[value]
+        raise exceptions.ValidationError(
+            self.error_messages['invalid_choice'],
+            code='invalid_choice',
+            params={'value': value},
+        )
+
+    def get_prep_value(self, value):
+        if value is None:
+            return None
+        # Unknown codes match nothing in lookups (and fail NOT NULL on save)
+        return self._code_to_int.get(str(value))
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj) or ''
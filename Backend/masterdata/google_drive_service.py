@@ -1,88 +1,290 @@
 import json
-import tempfile
+import logging
 import os
-from typing import List, Dict, Optional, Any
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
+import random
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Optional, Any, Tuple, Union, Iterator
+from cachetools import TTLCache
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaFileUpload, MediaIoBaseDownload
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 from users.models import GoogleDriveSettings
 import io
 
+logger = logging.getLogger(__name__)
+
+
+class DriveError(Exception):
+    """Raised when a Google Drive operation fails"""
+
+# The Google client libraries (discovery, oauth2, media helpers) are heavy to
+# import, so they are loaded on first use instead of at module import time.
+
+# Shared drive and root folder IDs rarely change, so they are cached per process
+# (keyed by account email and configured names) to avoid re-listing drives on
+# every GoogleDriveService instance.
+DRIVE_LOOKUP_CACHE_TTL = 3600  # seconds
+_shared_drive_id_cache = TTLCache(maxsize=32, ttl=DRIVE_LOOKUP_CACHE_TTL)
+_root_folder_cache = TTLCache(maxsize=32, ttl=DRIVE_LOOKUP_CACHE_TTL)
+_drive_lookup_lock = threading.Lock()
+
+# folder_id -> (name, parent_id). Folder/parent edges change rarely, so repeated
+# path resolutions (e.g. every upload into a dated account folder) reuse them.
+_folder_parent_cache = TTLCache(maxsize=4096, ttl=DRIVE_LOOKUP_CACHE_TTL)
+
+# Parsed service account credentials, keyed by (email, key file path), and
+# built Drive clients per thread keyed the same way. Loading the key file and
+# parsing the RSA key on every GoogleDriveService() is pure overhead.
+DRIVE_SCOPES = ['https://www.googleapis.com/auth/drive']
+_credentials_cache = {}
+_credentials_lock = threading.Lock()
+_thread_services = threading.local()
+
+FILE_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+
+# files().list page size (the API maximum)
+LIST_PAGE_SIZE = 1000
+
+# Maximum number of parent IDs OR-ed together in a single files().list query
+FOLDER_TREE_PARENT_BATCH = 50
+
+# Maximum number of calls Drive accepts in a single batch HTTP request
+DRIVE_BATCH_LIMIT = 100
+
+# Media download chunk size (MediaIoBaseDownload defaults to 100 KiB, which
+# turns a multi-MB packing slip PDF into dozens of round-trips)
+DOWNLOAD_CHUNK_SIZE = 16 * 1024 * 1024
+
+# Shared pool for overlapping independent Drive calls (I/O bound, so threads
+# are fine); created on first use
+DRIVE_POOL_WORKERS = 8
+_drive_pool = None
+_drive_pool_lock = threading.Lock()
+
+# Files at or above this size are uploaded with a resumable session, in chunks
+RESUMABLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Media transfers retry 5xx/429 per chunk inside the client library
+MEDIA_NUM_RETRIES = 5
+
+# Drive reports per-user/project throttling as 403 with one of these reasons
+RATE_LIMIT_REASONS = {'rateLimitExceeded', 'userRateLimitExceeded'}
+
+
+def _is_retryable_http_error(exc: BaseException) -> bool:
+    """True for transient Drive errors (429, 5xx, 403 rate limits); 401/403/404 are raised immediately"""
+    if not isinstance(exc, HttpError):
+        return False
+    status = exc.resp.status
+    if status == 429 or status >= 500:
+        return True
+    if status == 403:
+        reasons = {detail.get('reason') for detail in (exc.error_details or []) if isinstance(detail, dict)}
+        return bool(reasons & RATE_LIMIT_REASONS)
+    return False
+
+
+# Exponential backoff with jitter for non-media Drive calls; the last error is re-raised
+DRIVE_RETRY_ATTEMPTS = 6
+DRIVE_RETRY_INITIAL_WAIT = 1  # seconds
+DRIVE_RETRY_MAX_WAIT = 32  # seconds
+
+drive_retry = retry(
+    retry=retry_if_exception(_is_retryable_http_error),
+    wait=wait_exponential_jitter(initial=DRIVE_RETRY_INITIAL_WAIT, max=DRIVE_RETRY_MAX_WAIT),
+    stop=stop_after_attempt(DRIVE_RETRY_ATTEMPTS),
+    reraise=True,
+)
+
+
+def _retry_wait(attempt: int) -> float:
+    """The wait drive_retry uses after the given (1-based) failed attempt"""
+    return min(DRIVE_RETRY_INITIAL_WAIT * 2 ** (attempt - 1) + random.uniform(0, 1), DRIVE_RETRY_MAX_WAIT)
+
+
+@drive_retry
+def _execute(request):
+    """Execute a Drive API (or batch) request, retrying transient failures"""
+    return request.execute()
+
+
+# Drive file/folder/drive IDs are URL-safe base64-ish tokens
+DRIVE_ID_PATTERN = re.compile(r'^[A-Za-z0-9_\-]+$')
+
+
+def _q(value: str) -> str:
+    """Escape a string literal for use inside a Drive q= query"""
+    return value.replace('\\', '\\\\').replace("'", "\\'")
+
+
+def _drive_id(value: str) -> str:
+    """Validate a Drive ID before interpolating it into a q= query"""
+    if not isinstance(value, str) or not DRIVE_ID_PATTERN.match(value):
+        raise ValueError(f"Invalid Google Drive ID: {value!r}")
+    return value
+
+
+def _get_drive_pool() -> ThreadPoolExecutor:
+    """Return the process-wide Drive thread pool, creating it on first use"""
+    global _drive_pool
+    with _drive_pool_lock:
+        if _drive_pool is None:
+            _drive_pool = ThreadPoolExecutor(max_workers=DRIVE_POOL_WORKERS, thread_name_prefix='drive')
+        return _drive_pool
+
+
 class GoogleDriveService:
     """Google Drive service for managing folders and files using service account credentials"""
     
     def __init__(self, email: str):
         """Initialize the service with a specific Google Drive settings email"""
         self.email = email
+        self._local = threading.local()
         self.service = None
         self.credentials = None
         self.settings = None
+        self._credentials_key = None
+        self._shared_drive_id = None
+        self._root_folder = None
         self._initialize_service()
     
+    @property
+    def service(self):
+        """Drive API client for the calling thread (httplib2 connections are not thread-safe)"""
+        service = getattr(self._local, 'service', None)
+        if service is None and self.credentials is not None:
+            service = self._local.service = self._build_service()
+        return service
+    
+    @service.setter
+    def service(self, value):
+        self._local.service = value
+    
+    def _build_service(self):
+        """Return this thread's Drive v3 client for the loaded credentials, building it once"""
+        from googleapiclient.discovery import build
+
+        services = getattr(_thread_services, 'services', None)
+        if services is None:
+            services = _thread_services.services = {}
+        
+        service = services.get(self._credentials_key)
+        if service is None:
+            service = build('drive', 'v3', credentials=self.credentials)
+            if self._credentials_key is not None:
+                services[self._credentials_key] = service
+        return service
+    
+    def _load_credentials(self, service_account_path: str):
+        """Load service account credentials, reusing the parsed key across instances"""
+        from google.oauth2 import service_account
+
+        cache_key = (self.email, service_account_path)
+        with _credentials_lock:
+            credentials = _credentials_cache.get(cache_key)
+        if credentials is None:
+            # Check if file exists
+            if not os.path.exists(service_account_path):
+                raise DriveError(f"Service account file not found at: {service_account_path}")
+            
+            logger.debug("Service account file exists, loading credentials...")
+            with open(service_account_path) as f:
+                info = json.load(f)
+            credentials = service_account.Credentials.from_service_account_info(info, scopes=DRIVE_SCOPES)
+            with _credentials_lock:
+                credentials = _credentials_cache.setdefault(cache_key, credentials)
+        
+        self._credentials_key = cache_key
+        return credentials
+    
     def _initialize_service(self):
         """Initialize the Google Drive service with credentials from database"""
         try:
-            print(f"Looking for GoogleDriveSettings for email: {self.email}")
+            logger.debug("Looking for GoogleDriveSettings for email: %s", self.email)
             # Get the Google Drive settings for this email
-            self.settings = GoogleDriveSettings.objects.get(email=self.email, is_active=True)
-            print(f"Found settings: {self.settings}")
+            self.settings = GoogleDriveSettings.objects.only(
+                'email', 'service_account_json', 'shared_drive_name', 'root_folder_name', 'is_active'
+            ).get(email=self.email, is_active=True)
+            logger.debug("Found settings: %s", self.settings)
             
             # Read the service account JSON file
             service_account_path = self.settings.service_account_json.path
-            print(f"Service account path: {service_account_path}")
+            logger.debug("Service account path: %s", service_account_path)
             
-            # Check if file exists
-            if not os.path.exists(service_account_path):
-                raise Exception(f"Service account file not found at: {service_account_path}")
-            
-            print(f"Service account file exists, loading credentials...")
-            # Load credentials from the JSON file
-            self.credentials = service_account.Credentials.from_service_account_file(
-                service_account_path,
-                scopes=['https://www.googleapis.com/auth/drive']
-            )
-            print("Credentials loaded successfully")
+            # Load credentials from the JSON file (cached per account)
+            self.credentials = self._load_credentials(service_account_path)
+            logger.debug("Credentials loaded successfully")
             
             # Build the Drive service
-            self.service = build('drive', 'v3', credentials=self.credentials)
-            print("Google Drive service built successfully")
+            self.service = self._build_service()
+            logger.debug("Google Drive service built successfully")
             
         except GoogleDriveSettings.DoesNotExist:
-            print(f"No active Google Drive settings found for email: {self.email}")
-            raise Exception(f"No active Google Drive settings found for email: {self.email}")
+            logger.warning("No active Google Drive settings found for email: %s", self.email)
+            raise DriveError(f"No active Google Drive settings found for email: {self.email}")
         except Exception as e:
-            print(f"Error initializing Google Drive service: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise Exception(f"Failed to initialize Google Drive service: {str(e)}")
+            logger.exception("Error initializing Google Drive service: %s", e)
+            raise DriveError(f"Failed to initialize Google Drive service: {str(e)}") from e
     
+    def invalidate_cache(self):
+        """Drop cached credentials and shared drive / root folder lookups for this account"""
+        self._shared_drive_id = None
+        self._root_folder = None
+        with _drive_lookup_lock:
+            for cache in (_shared_drive_id_cache, _root_folder_cache):
+                for key in [k for k in cache.keys() if k[0] == self.email]:
+                    cache.pop(key, None)
+        with _credentials_lock:
+            for key in [k for k in _credentials_cache if k[0] == self.email]:
+                _credentials_cache.pop(key, None)
+
     def get_shared_drive_id(self) -> Optional[str]:
         """Get the configured shared drive ID"""
+        if self._shared_drive_id:
+            return self._shared_drive_id
+
+        cache_key = (self.email, self.settings.shared_drive_name)
+        with _drive_lookup_lock:
+            cached_id = _shared_drive_id_cache.get(cache_key)
+        if cached_id:
+            self._shared_drive_id = cached_id
+            return cached_id
+
         try:
             shared_drive_name = self.settings.shared_drive_name
-            print(f"Searching for '{shared_drive_name}' shared drive...")
-            results = self.service.drives().list().execute()
+            logger.debug("Searching for '%s' shared drive...", shared_drive_name)
+            results = _execute(self.service.drives().list())
             drives = results.get('drives', [])
             
-            print(f"Found {len(drives)} shared drives:")
+            logger.debug("Found %d shared drives", len(drives))
             for drive in drives:
-                print(f"  - {drive['name']} (ID: {drive['id']})")
+                logger.debug("  - %s (ID: %s)", drive['name'], drive['id'])
                 if drive['name'] == shared_drive_name:
-                    print(f"Found {shared_drive_name} shared drive: {drive['id']}")
+                    logger.debug("Found %s shared drive: %s", shared_drive_name, drive['id'])
+                    self._shared_drive_id = drive['id']
+                    with _drive_lookup_lock:
+                        _shared_drive_id_cache[cache_key] = drive['id']
                     return drive['id']
             
-            print(f"{shared_drive_name} shared drive not found in available drives")
+            logger.warning("%s shared drive not found in available drives", shared_drive_name)
             if not drives:
-                print("No shared drives found - service account may not have access to any shared drives")
+                logger.warning("No shared drives found - service account may not have access to any shared drives")
             return None
             
         except HttpError as e:
-            print(f"HttpError getting shared drives: {str(e)}")
+            logger.error("HttpError getting shared drives: %s", e)
             return None
 
     def get_root_folder(self) -> Optional[Dict]:
         """Get or create the main root folder in shared drive"""
+        if self._root_folder:
+            return self._root_folder
+
         try:
             # Get the shared drive ID
             shared_drive_id = self.get_shared_drive_id()
@@ -90,29 +292,36 @@ class GoogleDriveService:
             root_folder_name = self.settings.root_folder_name
             
             if not shared_drive_id:
-                raise Exception(f"{shared_drive_name} shared drive not found. Please make sure it exists and the service account has access.")
+                raise DriveError(f"{shared_drive_name} shared drive not found. Please make sure it exists and the service account has access.")
+            
+            cache_key = (self.email, shared_drive_id, root_folder_name)
+            with _drive_lookup_lock:
+                cached_folder = _root_folder_cache.get(cache_key)
+            if cached_folder:
+                self._root_folder = cached_folder
+                return cached_folder
             
-            print(f"Searching for existing {root_folder_name} folder in shared drive...")
+            logger.debug("Searching for existing %s folder in shared drive...", root_folder_name)
             # Search for existing root folder in the shared drive
-            query = f"name='{root_folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false and '{shared_drive_id}' in parents"
-            print(f"Query: {query}")
-            results = self.service.files().list(
+            query = f"name='{_q(root_folder_name)}' and mimeType='application/vnd.google-apps.folder' and trashed=false and '{_drive_id(shared_drive_id)}' in parents"
+            logger.debug("Query: %s", query)
+            results = _execute(self.service.files().list(
                 q=query, 
                 fields="files(id, name, parents)",
                 driveId=shared_drive_id,
                 includeItemsFromAllDrives=True,
                 supportsAllDrives=True,
                 corpora='drive'
-            ).execute()
+            ))
             
             items = results.get('files', [])
-            print(f"Found {len(items)} {root_folder_name} folders in shared drive")
+            logger.debug("Found %d %s folders in shared drive", len(items), root_folder_name)
             
             if items:
-                print(f"Using existing {root_folder_name} folder: {items[0]}")
-                return items[0]
+                logger.debug("Using existing %s folder: %s", root_folder_name, items[0])
+                folder = items[0]
             else:
-                print(f"No {root_folder_name} folder found in shared drive, creating new one...")
+                logger.info("No %s folder found in shared drive, creating new one...", root_folder_name)
                 # Create root folder in shared drive root
                 file_metadata = {
                     'name': root_folder_name,
@@ -120,23 +329,25 @@ class GoogleDriveService:
                     'parents': [shared_drive_id]
                 }
                 
-                folder = self.service.files().create(
+                folder = _execute(self.service.files().create(
                     body=file_metadata,
                     fields='id, name, createdTime, modifiedTime, parents',
                     supportsAllDrives=True
-                ).execute()
+                ))
                 
-                print(f"Created new {root_folder_name} folder in shared drive: {folder}")
-                return folder
+                logger.info("Created new %s folder in shared drive: %s", root_folder_name, folder)
+            
+            self._root_folder = folder
+            with _drive_lookup_lock:
+                _root_folder_cache[cache_key] = folder
+            return folder
                 
         except HttpError as e:
-            print(f"HttpError in get_root_folder: {str(e)}")
-            raise Exception(f"Error accessing root folder: {str(e)}")
+            logger.error("HttpError in get_root_folder: %s", e)
+            raise DriveError(f"Error accessing root folder: {str(e)}") from e
         except Exception as e:
-            print(f"Unexpected error in get_root_folder: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise Exception(f"Error accessing root folder: {str(e)}")
+            logger.exception("Unexpected error in get_root_folder: %s", e)
+            raise DriveError(f"Error accessing root folder: {str(e)}") from e
     
     def list_folders(self, parent_id: Optional[str] = None) -> List[Dict]:
         """List all folders in the specified parent folder"""
@@ -146,48 +357,62 @@ class GoogleDriveService:
                 root_folder = self.get_root_folder()
                 parent_id = root_folder['id']
             
-            query = f"'{parent_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
-            results = self.service.files().list(
+            query = f"'{_drive_id(parent_id)}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
+            return list(self._paginate(
                 q=query,
-                fields="files(id, name, createdTime, modifiedTime, parents)",
-                orderBy="name",
-                includeItemsFromAllDrives=True,
-                supportsAllDrives=True
-            ).execute()
-            
-            return results.get('files', [])
+                fields="nextPageToken, files(id, name, createdTime, modifiedTime, parents)",
+                orderBy="name"
+            ))
             
         except HttpError as e:
-            raise Exception(f"Error listing folders: {str(e)}")
+            raise DriveError(f"Error listing folders: {str(e)}") from e
     
     def list_files(self, folder_id: str) -> List[Dict]:
         """List all files in the specified folder"""
         try:
-            query = f"'{folder_id}' in parents and mimeType!='application/vnd.google-apps.folder' and trashed=false"
-            results = self.service.files().list(
+            query = f"'{_drive_id(folder_id)}' in parents and mimeType!='application/vnd.google-apps.folder' and trashed=false"
+            return list(self._paginate(
                 q=query,
-                fields="files(id, name, size, mimeType, createdTime, modifiedTime, webViewLink)",
-                orderBy="name",
-                includeItemsFromAllDrives=True,
-                supportsAllDrives=True
-            ).execute()
-            
-            return results.get('files', [])
+                fields="nextPageToken, files(id, name, size, mimeType, createdTime, modifiedTime, webViewLink)",
+                orderBy="name"
+            ))
             
         except HttpError as e:
-            raise Exception(f"Error listing files: {str(e)}")
+            raise DriveError(f"Error listing files: {str(e)}") from e
+    
+    def _paginate(self, **list_kwargs) -> Iterator[Dict]:
+        """Yield every file matching a files().list query, following nextPageToken"""
+        list_kwargs.setdefault('includeItemsFromAllDrives', True)
+        list_kwargs.setdefault('supportsAllDrives', True)
+        page_token = None
+        while True:
+            results = _execute(self.service.files().list(
+                pageSize=LIST_PAGE_SIZE,
+                pageToken=page_token,
+                **list_kwargs
+            ))
+            yield from results.get('files', [])
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return
+    
+    def list_folder_contents(self, folder_id: str) -> Tuple[List[Dict], List[Dict]]:
+        """List folders and files of a folder, running both queries concurrently"""
+        files_future = _get_drive_pool().submit(self.list_files, folder_id)
+        folders = self.list_folders(folder_id)
+        return folders, files_future.result()
     
     def create_folder(self, name: str, parent_id: Optional[str] = None) -> Dict:
         """Create a new folder in shared drive"""
         try:
-            print(f"Creating folder '{name}' with parent_id: {parent_id}")
+            logger.debug("Creating folder '%s' with parent_id: %s", name, parent_id)
             
             if parent_id is None:
                 # Get the EMB folder as parent
-                print("Getting EMB folder as parent...")
+                logger.debug("Getting root folder as parent...")
                 root_folder = self.get_root_folder()
                 parent_id = root_folder['id']
-                print(f"Using EMB folder as parent: {parent_id}")
+                logger.debug("Using root folder as parent: %s", parent_id)
             
             file_metadata = {
                 'name': name,
@@ -195,78 +420,86 @@ class GoogleDriveService:
                 'parents': [parent_id]
             }
             
-            print(f"File metadata: {file_metadata}")
-            folder = self.service.files().create(
+            logger.debug("File metadata: %s", file_metadata)
+            folder = _execute(self.service.files().create(
                 body=file_metadata,
                 fields='id, name, createdTime, modifiedTime, parents',
                 supportsAllDrives=True
-            ).execute()
+            ))
             
-            print(f"Successfully created folder: {folder}")
+            logger.debug("Successfully created folder: %s", folder)
             return folder
             
         except HttpError as e:
-            print(f"HttpError creating folder: {str(e)}")
-            raise Exception(f"Error creating folder: {str(e)}")
+            logger.error("HttpError creating folder: %s", e)
+            raise DriveError(f"Error creating folder: {str(e)}") from e
         except Exception as e:
-            print(f"Unexpected error creating folder: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            raise Exception(f"Error creating folder: {str(e)}")
+            logger.exception("Unexpected error creating folder: %s", e)
+            raise DriveError(f"Error creating folder: {str(e)}") from e
     
     def delete_folder(self, folder_id: str) -> bool:
         """Delete a folder from shared drive"""
         try:
-            print(f"Deleting folder with ID: {folder_id}")
-            self.service.files().delete(
+            logger.debug("Deleting folder with ID: %s", folder_id)
+            _execute(self.service.files().delete(
                 fileId=folder_id,
                 supportsAllDrives=True
-            ).execute()
-            print(f"Folder deleted successfully")
+            ))
+            with _drive_lookup_lock:
+                _folder_parent_cache.pop(folder_id, None)
+            logger.debug("Folder deleted successfully")
             return True
             
         except HttpError as e:
-            print(f"HttpError deleting folder: {str(e)}")
-            raise Exception(f"Error deleting folder: {str(e)}")
+            logger.error("HttpError deleting folder: %s", e)
+            raise DriveError(f"Error deleting folder: {str(e)}") from e
     
     def upload_file(self, file_path: str, file_name: str, folder_id: str, mime_type: str = None) -> Dict:
         """Upload a file to the specified folder"""
+        from googleapiclient.http import MediaFileUpload
+
         try:
             file_metadata = {
                 'name': file_name,
                 'parents': [folder_id]
             }
             
-            media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True)
+            # Resumable uploads cost an extra session-init round-trip; only use them
+            # for large files and send small ones as a single multipart request
+            resumable = os.path.getsize(file_path) >= RESUMABLE_UPLOAD_THRESHOLD
+            if resumable:
+                media = MediaFileUpload(file_path, mimetype=mime_type, resumable=True, chunksize=UPLOAD_CHUNK_SIZE)
+            else:
+                media = MediaFileUpload(file_path, mimetype=mime_type, resumable=False)
             
             file = self.service.files().create(
                 body=file_metadata,
                 media_body=media,
                 fields='id, name, size, mimeType, createdTime, modifiedTime, webViewLink',
                 supportsAllDrives=True
-            ).execute()
+            ).execute(num_retries=MEDIA_NUM_RETRIES)
             
             return file
             
         except HttpError as e:
-            raise Exception(f"Error uploading file: {str(e)}")
+            raise DriveError(f"Error uploading file: {str(e)}") from e
     
     def delete_file(self, file_id: str) -> bool:
         """Delete a file (move to trash)"""
         try:
-            self.service.files().delete(
+            _execute(self.service.files().delete(
                 fileId=file_id,
                 supportsAllDrives=True
-            ).execute()
+            ))
             return True
             
         except HttpError as e:
-            raise Exception(f"Error deleting file: {str(e)}")
+            raise DriveError(f"Error deleting file: {str(e)}") from e
     
     def share_with_account_owner(self, file_id: str, role: str = 'writer') -> bool:
         """Share a file/folder with the account owner (personal Google account)"""
         try:
-            print(f"Sharing file {file_id} with account owner: {self.email}")
+            logger.debug("Sharing file %s with account owner: %s", file_id, self.email)
             
             permission = {
                 'type': 'user',
@@ -274,20 +507,129 @@ class GoogleDriveService:
                 'emailAddress': self.email
             }
             
-            self.service.permissions().create(
+            _execute(self.service.permissions().create(
                 fileId=file_id,
                 body=permission,
                 sendNotificationEmail=False  # Don't send email notification
-            ).execute()
+            ))
             
-            print(f"Successfully shared with {self.email}")
+            logger.debug("Successfully shared with %s", self.email)
             return True
             
         except HttpError as e:
-            print(f"Error sharing file: {str(e)}")
+            logger.error("Error sharing file: %s", e)
             # Don't fail the creation if sharing fails
             return False
 
+    def _execute_batched(self, make_requests: Dict[str, Callable], callback) -> None:
+        """
+        Run requests in batches of DRIVE_BATCH_LIMIT. _execute only retries the
+        batch call itself; items that fail transiently inside it (429, 5xx, 403
+        rate limits) are re-submitted in the next batch with drive_retry's backoff,
+        up to DRIVE_RETRY_ATTEMPTS tries.
+
+        Args:
+            make_requests: request_id -> function building that item's request
+            callback: called once per item with its final (request_id, response, exception)
+        """
+        pending = list(make_requests)
+        for attempt in range(1, DRIVE_RETRY_ATTEMPTS + 1):
+            retry_ids = []
+            
+            def on_item(request_id, response, exception):
+                if exception is not None and attempt < DRIVE_RETRY_ATTEMPTS and _is_retryable_http_error(exception):
+                    retry_ids.append(request_id)
+                else:
+                    callback(request_id, response, exception)
+            
+            for start in range(0, len(pending), DRIVE_BATCH_LIMIT):
+                batch = self.service.new_batch_http_request(callback=on_item)
+                for request_id in pending[start:start + DRIVE_BATCH_LIMIT]:
+                    batch.add(make_requests[request_id](), request_id=request_id)
+                _execute(batch)
+            
+            if not retry_ids:
+                return
+            logger.warning("Retrying %d throttled/failed Drive batch items (attempt %d)", len(retry_ids), attempt + 1)
+            pending = retry_ids
+            time.sleep(_retry_wait(attempt))
+
+    def create_folders(self, folders: List[Tuple[str, str]], share_role: Optional[str] = None) -> List[Union[Dict, Exception]]:
+        """
+        Create many folders using batched Drive requests.
+
+        Args:
+            folders: List of (name, parent_id) tuples
+            share_role: If set, also share every created folder with the account owner
+
+        Returns:
+            List aligned with `folders` holding the created folder dict, or the
+            exception raised for that folder
+        """
+        results: List[Union[Dict, Exception]] = [None] * len(folders)
+        
+        def on_created(request_id, response, exception):
+            results[int(request_id)] = exception if exception is not None else response
+        
+        def make_create(name, parent_id):
+            return lambda: self.service.files().create(
+                body={
+                    'name': name,
+                    'mimeType': FOLDER_MIME_TYPE,
+                    'parents': [parent_id]
+                },
+                fields='id, name, createdTime, modifiedTime, parents',
+                supportsAllDrives=True
+            )
+        
+        self._execute_batched(
+            {str(index): make_create(name, parent_id) for index, (name, parent_id) in enumerate(folders)},
+            on_created
+        )
+        
+        if share_role:
+            created_ids = [result['id'] for result in results if isinstance(result, dict)]
+            self.share_many_with_account_owner(created_ids, share_role)
+        
+        return results
+    
+    def create_folder_and_share(self, name: str, parent_id: Optional[str] = None, role: str = 'writer') -> Dict:
+        """Create a folder and share it with the account owner"""
+        if parent_id is None:
+            parent_id = self.get_root_folder()['id']
+        
+        result = self.create_folders([(name, parent_id)], share_role=role)[0]
+        if isinstance(result, Exception):
+            raise DriveError(f"Error creating folder: {str(result)}") from result
+        return result
+    
+    def share_many_with_account_owner(self, file_ids: List[str], role: str = 'writer') -> Dict[str, bool]:
+        """Share several files/folders with the account owner using batched requests"""
+        shared = {}
+        
+        def on_shared(request_id, response, exception):
+            if exception is not None:
+                logger.error("Error sharing file %s: %s", request_id, exception)
+            shared[request_id] = exception is None
+        
+        permission = {
+            'type': 'user',
+            'role': role,
+            'emailAddress': self.email
+        }
+        
+        def make_share(file_id):
+            return lambda: self.service.permissions().create(
+                fileId=file_id,
+                body=permission,
+                sendNotificationEmail=False,
+                supportsAllDrives=True
+            )
+        
+        self._execute_batched({file_id: make_share(file_id) for file_id in file_ids}, on_shared)
+        
+        return shared
+
     def get_folder_tree(self, parent_id: Optional[str] = None) -> Dict:
         """Get the complete folder tree structure"""
         try:
@@ -298,36 +640,96 @@ class GoogleDriveService:
                 folder_info = root_folder
             else:
                 # Get folder info
-                folder_info = self.service.files().get(
+                folder_info = _execute(self.service.files().get(
                     fileId=parent_id,
-                    fields="id, name, createdTime, modifiedTime, parents"
-                ).execute()
-            
-            # Get subfolders
-            subfolders = self.list_folders(parent_id)
-            
-            # Get files
-            files = self.list_files(parent_id)
-            
-            # Recursively build tree for subfolders
-            folder_tree = {
-                'id': folder_info['id'],
-                'name': folder_info['name'],
-                'type': 'folder',
-                'createdTime': folder_info.get('createdTime'),
-                'modifiedTime': folder_info.get('modifiedTime'),
-                'children': [],
-                'files': files
-            }
-            
-            for subfolder in subfolders:
-                subfolder_tree = self.get_folder_tree(subfolder['id'])
-                folder_tree['children'].append(subfolder_tree)
-            
-            return folder_tree
+                    fields="id, name, createdTime, modifiedTime, parents",
+                    supportsAllDrives=True
+                ))
+            
+            root_node = self._folder_tree_node(folder_info)
+            nodes = {parent_id: root_node}
+            
+            # Walk the tree level by level: one query per group of parents
+            # instead of two queries (folders + files) per folder.
+            frontier = [parent_id]
+            while frontier:
+                next_frontier = []
+                batches = [
+                    frontier[i:i + FOLDER_TREE_PARENT_BATCH]
+                    for i in range(0, len(frontier), FOLDER_TREE_PARENT_BATCH)
+                ]
+                if len(batches) > 1:
+                    # Wide levels: query the parent groups concurrently
+                    level_children = _get_drive_pool().map(self._list_children, batches)
+                else:
+                    level_children = [self._list_children(batches[0])]
+                
+                for children in level_children:
+                    for item in children:
+                        parent_node = next(
+                            (nodes[p] for p in item.get('parents', []) if p in nodes),
+                            None
+                        )
+                        if parent_node is None:
+                            continue
+                        
+                        if item.get('mimeType') == FOLDER_MIME_TYPE:
+                            child_node = self._folder_tree_node(item)
+                            nodes[item['id']] = child_node
+                            parent_node['children'].append(child_node)
+                            next_frontier.append(item['id'])
+                        else:
+                            item.pop('parents', None)
+                            parent_node['files'].append(item)
+                frontier = next_frontier
+            
+            return root_node
             
         except HttpError as e:
-            raise Exception(f"Error building folder tree: {str(e)}")
+            raise DriveError(f"Error building folder tree: {str(e)}") from e
+    
+    def _list_children(self, parent_ids: List[str]) -> List[Dict]:
+        """List all non-trashed children (folders and files) of the given parents in one query"""
+        parents_query = " or ".join(f"'{_drive_id(pid)}' in parents" for pid in parent_ids)
+        query = f"({parents_query}) and trashed=false"
+        
+        return list(self._paginate(
+            q=query,
+            fields="nextPageToken, files(id, name, mimeType, parents, size, createdTime, modifiedTime, webViewLink)",
+            orderBy="name"
+        ))
+    
+    @staticmethod
+    def _folder_tree_node(folder_info: Dict) -> Dict:
+        """Build an empty folder tree node from Drive folder metadata"""
+        return {
+            'id': folder_info['id'],
+            'name': folder_info['name'],
+            'type': 'folder',
+            'createdTime': folder_info.get('createdTime'),
+            'modifiedTime': folder_info.get('modifiedTime'),
+            'children': [],
+            'files': []
+        }
+    
+    def _get_folder_parent(self, folder_id: str) -> Tuple[str, Optional[str]]:
+        """Get (name, parent_id) for a folder, using the process-wide parent cache"""
+        with _drive_lookup_lock:
+            cached = _folder_parent_cache.get(folder_id)
+        if cached:
+            return cached
+        
+        folder = _execute(self.service.files().get(
+            fileId=folder_id,
+            fields="id, name, parents",
+            supportsAllDrives=True
+        ))
+        
+        parents = folder.get('parents', [])
+        entry = (folder['name'], parents[0] if parents else None)
+        with _drive_lookup_lock:
+            _folder_parent_cache[folder_id] = entry
+        return entry
     
     def get_folder_path(self, folder_id: str) -> List[Dict]:
         """Get the full path from root to the specified folder"""
@@ -335,25 +737,34 @@ class GoogleDriveService:
             path = []
             current_id = folder_id
             shared_drive_id = self.get_shared_drive_id()
+            root_folder_name = self.settings.root_folder_name
+            
+            # Use the root folder if it is already known so the walk can end
+            # one level early without fetching it
+            root_folder = self._root_folder
+            if root_folder is None:
+                with _drive_lookup_lock:
+                    root_folder = _root_folder_cache.get((self.email, shared_drive_id, root_folder_name))
+            root_folder_id = root_folder['id'] if root_folder else None
             
             while current_id:
-                folder = self.service.files().get(
-                    fileId=current_id,
-                    fields="id, name, parents",
-                    supportsAllDrives=True
-                ).execute()
+                name, parent_id = self._get_folder_parent(current_id)
                 
                 path.insert(0, {
-                    'id': folder['id'],
-                    'name': folder['name']
+                    'id': current_id,
+                    'name': name
                 })
                 
                 # Move to parent
-                parents = folder.get('parents', [])
-                if parents:
-                    parent_id = parents[0]
-                    # Stop if we reach the shared drive root or EMB folder
-                    if parent_id == shared_drive_id or folder['name'] == 'EMB':
+                if parent_id:
+                    # Stop if we reach the shared drive root or the root folder
+                    if parent_id == shared_drive_id or name == root_folder_name:
+                        break
+                    if parent_id == root_folder_id:
+                        path.insert(0, {
+                            'id': root_folder_id,
+                            'name': root_folder['name']
+                        })
                         break
                     current_id = parent_id
                 else:
@@ -362,102 +773,124 @@ class GoogleDriveService:
             return path
             
         except HttpError as e:
-            raise Exception(f"Error getting folder path: {str(e)}")
+            raise DriveError(f"Error getting folder path: {str(e)}") from e
     
     def search_files(self, query: str, folder_id: Optional[str] = None) -> List[Dict]:
         """Search for files by name"""
         try:
-            search_query = f"name contains '{query}' and trashed=false"
+            search_query = f"name contains '{_q(query)}' and trashed=false"
             
             if folder_id:
-                search_query += f" and '{folder_id}' in parents"
+                search_query += f" and '{_drive_id(folder_id)}' in parents"
             
-            results = self.service.files().list(
-                q=search_query,
-                fields="files(id, name, size, mimeType, createdTime, modifiedTime, webViewLink, parents)",
-                orderBy="name"
-            ).execute()
+            # Restrict the search to the configured shared drive instead of every corpus
+            list_kwargs = {}
+            shared_drive_id = self.get_shared_drive_id()
+            if shared_drive_id:
+                list_kwargs = {'corpora': 'drive', 'driveId': shared_drive_id}
             
-            return results.get('files', [])
+            return list(self._paginate(
+                q=search_query,
+                fields="nextPageToken, files(id, name, size, mimeType, createdTime, modifiedTime, webViewLink, parents)",
+                orderBy="name",
+                **list_kwargs
+            ))
             
         except HttpError as e:
-            raise Exception(f"Error searching files: {str(e)}")
+            raise DriveError(f"Error searching files: {str(e)}") from e
 
     def format_file_size(self, size_bytes: int) -> str:
         """Format file size in human readable format"""
         if not size_bytes:
             return "0 B"
         
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size_bytes < 1024.0:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024.0
-        return f"{size_bytes:.1f} PB"
+        # Unit index straight from the bit length: every 10 bits is one 1024x step
+        size_bytes = int(size_bytes)
+        unit_index = min((size_bytes.bit_length() - 1) // 10, len(FILE_SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (10 * unit_index)):.1f} {FILE_SIZE_UNITS[unit_index]}"
 
     def download_file(self, file_id: str, destination_path: str) -> bool:
         """Download a file from Google Drive to local path"""
+        from googleapiclient.http import MediaIoBaseDownload
+
         try:
             request = self.service.files().get_media(fileId=file_id)
             
-            with open(destination_path, 'wb') as f:
-                downloader = MediaIoBaseDownload(f, request)
+            with open(destination_path, 'wb', buffering=1024 * 1024) as f:
+                downloader = MediaIoBaseDownload(f, request, chunksize=DOWNLOAD_CHUNK_SIZE)
                 done = False
                 while done is False:
-                    status, done = downloader.next_chunk()
+                    status, done = downloader.next_chunk(num_retries=MEDIA_NUM_RETRIES)
             
             return True
             
         except HttpError as e:
-            raise Exception(f"Error downloading file: {str(e)}")
+            raise DriveError(f"Error downloading file: {str(e)}") from e
         except Exception as e:
-            raise Exception(f"Error downloading file: {str(e)}")
+            raise DriveError(f"Error downloading file: {str(e)}") from e
     
     def get_file_content(self, file_id: str) -> bytes:
         """Get file content as bytes for serving through API"""
+        from googleapiclient.http import MediaIoBaseDownload
+
         try:
             request = self.service.files().get_media(fileId=file_id)
             
             file_content = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_content, request)
+            downloader = MediaIoBaseDownload(file_content, request, chunksize=DOWNLOAD_CHUNK_SIZE)
             done = False
             while done is False:
-                status, done = downloader.next_chunk()
+                status, done = downloader.next_chunk(num_retries=MEDIA_NUM_RETRIES)
             
-            file_content.seek(0)  # Reset to beginning
-            return file_content.read()
+            return file_content.getvalue()
             
         except HttpError as e:
-            raise Exception(f"Error getting file content: {str(e)}")
+            raise DriveError(f"Error getting file content: {str(e)}") from e
         except Exception as e:
-            raise Exception(f"Error getting file content: {str(e)}")
+            raise DriveError(f"Error getting file content: {str(e)}") from e
+    
+    def iter_file_content(self, file_id: str, chunksize: int = DOWNLOAD_CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield file content chunk by chunk, for streaming responses without buffering the whole file"""
+        from googleapiclient.http import MediaIoBaseDownload
+
+        request = self.service.files().get_media(fileId=file_id)
+        
+        chunk_buffer = io.BytesIO()
+        downloader = MediaIoBaseDownload(chunk_buffer, request, chunksize=chunksize)
+        done = False
+        while done is False:
+            try:
+                status, done = downloader.next_chunk(num_retries=MEDIA_NUM_RETRIES)
+            except HttpError as e:
+                raise DriveError(f"Error getting file content: {str(e)}") from e
+            
+            yield chunk_buffer.getvalue()
+            chunk_buffer.seek(0)
+            chunk_buffer.truncate()
     
     def get_file_info(self, file_id: str) -> Dict:
         """Get file metadata"""
         try:
-            file_info = self.service.files().get(
+            file_info = _execute(self.service.files().get(
                 fileId=file_id,
                 fields='id, name, size, mimeType, createdTime, modifiedTime, webViewLink',
                 supportsAllDrives=True
-            ).execute()
+            ))
             
             return file_info
             
         except HttpError as e:
-            raise Exception(f"Error getting file info: {str(e)}")
+            raise DriveError(f"Error getting file info: {str(e)}") from e
         except Exception as e:
-            raise Exception(f"Error getting file info: {str(e)}")
+            raise DriveError(f"Error getting file info: {str(e)}") from e
     
     def get_folder_name(self, folder_id: str) -> str:
         """Get the name of a folder by its ID"""
         try:
-            folder = self.service.files().get(
-                fileId=folder_id,
-                fields="name",
-                supportsAllDrives=True
-            ).execute()
-            return folder.get('name', '')
+            name, _ = self._get_folder_parent(folder_id)
+            return name
         except HttpError as e:
-            raise Exception(f"Error getting folder name: {str(e)}")
+            raise DriveError(f"Error getting folder name: {str(e)}") from e
 
     @classmethod
     def get_available_drive_accounts(cls) -> List[Dict]:
@@ -465,7 +898,7 @@ class GoogleDriveService:
         try:
             settings = GoogleDriveSettings.objects.filter(is_active=True).values(
                 'id', 'email', 'created_by__fullname', 'created_at'
-            )
+            ).order_by()
             return list(settings)
         except Exception as e:
             return [] 
\ No newline at end of file
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0017_alter_packingslip_status'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='account',
+            name='account_name',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='name',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+    ]
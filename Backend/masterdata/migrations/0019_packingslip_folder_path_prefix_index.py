@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0018_product_name_account_name_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='packingslip',
+            name='folder_path',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddIndex(
+            model_name='packingslip',
+            index=models.Index(condition=models.Q(('folder_path', ''), _negated=True), fields=['folder_path'], name='ps_folderpath_prefix', opclasses=['text_pattern_ops']),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0019_packingslip_folder_path_prefix_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='packingslip',
+            index=models.Index(fields=['status', '-created_at'], name='ps_status_created_idx'),
+        ),
+    ]
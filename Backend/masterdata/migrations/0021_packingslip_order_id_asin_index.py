@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0020_packingslip_status_created_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='packingslip',
+            name='asin',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='packingslip',
+            name='order_id',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+    ]
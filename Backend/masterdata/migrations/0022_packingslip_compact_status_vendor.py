@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:26
+
+import masterdata.fields
+from django.db import migrations
+
+# Code order at the time of this migration; CompactChoiceField stores position + 1, '' as 0
+STATUS_CODES = [
+    'new_order', 'digitizing', 'ready_for_production', 'in_production',
+    'quality_check', 'ready_to_ship', 'shipped', 'delivered',
+]
+TRACKING_VENDOR_CODES = ['fedex', 'ups', 'usps']
+FIELD_CODES = {'status': STATUS_CODES, 'tracking_vendor': TRACKING_VENDOR_CODES}
+
+
+def codes_to_numbers(apps, schema_editor):
+    """Rewrite the string codes as digit strings so the column type change can cast them"""
+    PackingSlip = apps.get_model('masterdata', 'PackingSlip')
+    for field_name, codes in FIELD_CODES.items():
+        PackingSlip.objects.exclude(**{f'{field_name}__in': codes}).update(**{field_name: '0'})
+        for number, code in enumerate(codes, start=1):
+            PackingSlip.objects.filter(**{field_name: code}).update(**{field_name: str(number)})
+
+
+def numbers_to_codes(apps, schema_editor):
+    PackingSlip = apps.get_model('masterdata', 'PackingSlip')
+    for field_name, codes in FIELD_CODES.items():
+        PackingSlip.objects.filter(**{field_name: '0'}).update(**{field_name: ''})
+        for number, code in enumerate(codes, start=1):
+            PackingSlip.objects.filter(**{field_name: str(number)}).update(**{field_name: code})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0021_packingslip_order_id_asin_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(codes_to_numbers, numbers_to_codes),
+        migrations.AlterField(
+            model_name='packingslip',
+            name='status',
+            field=masterdata.fields.CompactChoiceField(choices=[('new_order', 'New Order'), ('digitizing', 'Digitizing'), ('ready_for_production', 'Ready For Production'), ('in_production', 'In Production'), ('quality_check', 'Quality Check'), ('ready_to_ship', 'Ready to Ship'), ('shipped', 'Shipped'), ('delivered', 'Delivered')], default='new_order'),
+        ),
+        migrations.AlterField(
+            model_name='packingslip',
+            name='tracking_vendor',
+            field=masterdata.fields.CompactChoiceField(blank=True, choices=[('fedex', 'FedEx'), ('ups', 'UPS'), ('usps', 'USPS')], default=''),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0022_packingslip_compact_status_vendor'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['account', '-date'], name='exp_acct_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='file',
+            index=models.Index(fields=['packing_slip', 'file_type'], name='file_ps_type_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0024_created_at_db_default'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='packingslip',
+            constraint=models.CheckConstraint(condition=models.Q(('quantity__gt', 0)), name='ps_qty_pos'),
+        ),
+        migrations.AddConstraint(
+            model_name='packingslip',
+            constraint=models.CheckConstraint(condition=models.Q(('item_cost__gte', 0), ('sales_price__gte', 0), ('shipping_cost__gte', 0), ('shipping_price__gte', 0)), name='ps_money_nonneg'),
+        ),
+        migrations.AddConstraint(
+            model_name='packingslip',
+            constraint=models.CheckConstraint(condition=models.Q(('platform_fee_percent__gte', 0), ('platform_fee_percent__lte', 100)), name='ps_fee_pct_range'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0025_packingslip_check_constraints'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='account',
+            name='account_name',
+            field=models.CharField(error_messages={'unique': 'Account with this name already exists.'}, max_length=255, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='code',
+            field=models.CharField(error_messages={'unique': 'Product with this code already exists.'}, max_length=255, unique=True),
+        ),
+    ]
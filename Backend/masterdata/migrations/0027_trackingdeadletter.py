@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0026_product_code_account_name_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrackingDeadLetter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('courier_code', models.CharField(max_length=20)),
+                ('error', models.TextField()),
+                ('attempts', models.PositiveSmallIntegerField()),
+                ('last_attempted_at', models.DateTimeField(auto_now=True)),
+                ('packing_slip', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tracking_dead_letters', to='masterdata.packingslip')),
+            ],
+            options={
+                'ordering': ('-last_attempted_at',),
+            },
+        ),
+    ]
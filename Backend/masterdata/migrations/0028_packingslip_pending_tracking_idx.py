@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0027_trackingdeadletter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='packingslip',
+            index=models.Index(condition=models.Q(('status', 'shipped'), models.Q(('tracking_ids', ''), _negated=True), models.Q(('tracking_vendor', ''), _negated=True)), fields=['tracking_vendor'], name='ps_pending_tracking_idx'),
+        ),
+    ]
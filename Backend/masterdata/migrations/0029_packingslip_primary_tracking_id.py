@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:55
+
+from django.db import migrations, models
+
+
+def backfill_primary_tracking_id(apps, schema_editor):
+    """Same parsing as PackingSlip.tracking_numbers: first non-blank comma-separated ID"""
+    PackingSlip = apps.get_model('masterdata', 'PackingSlip')
+    slips = []
+    for slip in PackingSlip.objects.exclude(tracking_ids='').only('id', 'tracking_ids').iterator(chunk_size=2000):
+        tracking_numbers = [tid.strip() for tid in slip.tracking_ids.split(',') if tid.strip()]
+        if tracking_numbers:
+            slip.primary_tracking_id = tracking_numbers[0][:64]
+            slips.append(slip)
+    PackingSlip.objects.bulk_update(slips, ['primary_tracking_id'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0028_packingslip_pending_tracking_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='packingslip',
+            name='primary_tracking_id',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(backfill_primary_tracking_id, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-14 04:58
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0029_packingslip_primary_tracking_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='account',
+            name='account_name',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='code',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name='account',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('account_name'), name='uniq_account_name_lower', violation_error_message='Account with this name already exists.'),
+        ),
+        migrations.AddConstraint(
+            model_name='product',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('code'), name='uniq_product_code_lower', violation_error_message='Product with this code already exists.'),
+        ),
+    ]
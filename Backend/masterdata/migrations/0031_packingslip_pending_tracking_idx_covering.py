@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-14 05:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0030_case_insensitive_product_code_account_name'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='packingslip',
+            name='ps_pending_tracking_idx',
+        ),
+        migrations.AddIndex(
+            model_name='packingslip',
+            index=models.Index(condition=models.Q(('status', 'shipped'), models.Q(('tracking_ids', ''), _negated=True), models.Q(('tracking_vendor', ''), _negated=True)), fields=['tracking_vendor', 'id'], name='ps_pending_tracking_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.6 on 2026-10-14 05:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+
+
+def merge_duplicate_dead_letters(apps, schema_editor):
+    """Fold repeated rows per packing slip into the latest one, summing attempts"""
+    TrackingDeadLetter = apps.get_model('masterdata', 'TrackingDeadLetter')
+    duplicates = (
+        TrackingDeadLetter.objects.values('packing_slip_id')
+        .annotate(latest_id=Max('id'), total_attempts=Sum('attempts'), rows=Count('id'))
+        .filter(rows__gt=1)
+    )
+    for row in duplicates:
+        TrackingDeadLetter.objects.filter(packing_slip_id=row['packing_slip_id']).exclude(id=row['latest_id']).delete()
+        TrackingDeadLetter.objects.filter(id=row['latest_id']).update(attempts=min(row['total_attempts'], 32767))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('masterdata', '0031_packingslip_pending_tracking_idx_covering'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_dead_letters, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='trackingdeadletter',
+            name='packing_slip',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='tracking_dead_letter', to='masterdata.packingslip'),
+        ),
+    ]
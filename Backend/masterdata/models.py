@@ -1,40 +1,98 @@
+import threading
+from decimal import Decimal
+
+from cachetools import TTLCache
 from django.db import models
+from django.db.models.functions import Lower, Now
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .fields import CompactChoiceField
 
 # Create your models here.
 
+# Shared Decimal constants for the fee/profit arithmetic, so mixing in the
+# int/float fallbacks doesn't build a new Decimal on every save
+ZERO = Decimal('0')
+HUNDRED = Decimal('100')
+
+# product_id -> (sku_buy_cost, sku_price) for PackingSlip.save(). Cleared on
+# Product save/delete in this process; the TTL bounds staleness in other workers.
+PRODUCT_COSTS_CACHE_TTL = 300  # seconds
+_product_costs_cache = TTLCache(maxsize=1024, ttl=PRODUCT_COSTS_CACHE_TTL)
+_product_costs_lock = threading.Lock()
+
 class Product(models.Model):
-    name = models.CharField(max_length=255)
-    code = models.CharField(max_length=255, unique=True)
+    name = models.CharField(max_length=255, db_index=True)
+    code = models.CharField(max_length=255, db_index=True)
     image = models.ImageField(upload_to='products/', null=True, blank=True)
     sku_description = models.TextField()
     sku_uom = models.CharField(max_length=255)
     sku_buy_cost = models.DecimalField(max_digits=10, decimal_places=2)
     sku_price = models.DecimalField(max_digits=10, decimal_places=2)
     color = models.CharField(max_length=255)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ("name",)
+        constraints = [
+            # Codes are unique ignoring case; the expression index serves LOWER(code) lookups
+            models.UniqueConstraint(Lower('code'), name='uniq_product_code_lower',
+                                    violation_error_message="Product with this code already exists."),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.code})"
 
 
 class Account(models.Model):
-    account_name = models.CharField(max_length=255)
+    account_name = models.CharField(max_length=255, db_index=True)
     active = models.BooleanField(default=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ("account_name",)
+        constraints = [
+            models.UniqueConstraint(Lower('account_name'), name='uniq_account_name_lower',
+                                    violation_error_message="Account with this name already exists."),
+        ]
 
     def __str__(self):
         return self.account_name
 
 
+# Large free-text columns that list/dashboard rows usually don't render
+SUMMARY_DEFERRED_FIELDS = ('ship_to', 'customizations', 'tracking_ids', 'folder_path')
+
+# Shipped orders the tracking updater still has to poll (shared by the queryset and its partial index)
+PENDING_TRACKING = models.Q(status='shipped') & ~models.Q(tracking_ids='') & ~models.Q(tracking_vendor='')
+
+
+class PackingSlipQuerySet(models.QuerySet):
+    def with_product(self):
+        """Join the product in the same query; use for any list that shows product code/name"""
+        return self.select_related('product')
+    
+    def summaries(self, *keep):
+        """Defer the large text columns for list rows; name any of them the caller still reads in ``keep``"""
+        return self.defer(*(f for f in SUMMARY_DEFERRED_FIELDS if f not in keep))
+    
+    def with_files(self):
+        """Prefetch each slip's files in one extra query (only the columns FileSerializer renders)"""
+        return self.prefetch_related(models.Prefetch(
+            'files',
+            queryset=File.objects.only('id', 'packing_slip_id', 'file_type', 'file_path', 'page_number', 'created_at'),
+        ))
+    
+    def pending_tracking(self):
+        """Shipped slips with tracking IDs and a vendor set, i.e. the ones whose delivery status to poll"""
+        return self.filter(PENDING_TRACKING)
+
+
 class PackingSlip(models.Model):
+    # Stored as small integers by CompactChoiceField: append new choices, never reorder
     STATUS_CHOICES = [
         ('new_order', 'New Order'),
         ('digitizing', 'Digitizing'),
@@ -53,13 +111,13 @@ class PackingSlip(models.Model):
     ]
     
     ship_to = models.TextField(blank=True, default='')  # Store full shipping address (optional)
-    order_id = models.CharField(max_length=255)
-    asin = models.CharField(max_length=255)
+    order_id = models.CharField(max_length=255, db_index=True)
+    asin = models.CharField(max_length=255, db_index=True)
     product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='packing_slips')
     customizations = models.TextField(blank=True, default='')  # Store all customization details
     quantity = models.IntegerField()
-    folder_path = models.CharField(max_length=500, blank=True, default='')  # Store folder path where file was uploaded
-    status = models.CharField(max_length=30, choices=STATUS_CHOICES, default='new_order')
+    folder_path = models.TextField(blank=True, default='')  # Store folder path where file was uploaded
+    status = CompactChoiceField(choices=STATUS_CHOICES, default='new_order')
     
     # New financial fields
     sales_price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
@@ -70,28 +128,89 @@ class PackingSlip(models.Model):
     platform_fee_calculated = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     profit = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     tracking_ids = models.TextField(blank=True, default='')  # Store tracking IDs (comma-separated or JSON)
+    # First of tracking_ids, kept in sync by save() so the tracking updater needn't parse the list
+    primary_tracking_id = models.CharField(max_length=64, blank=True, default='', db_index=True, editable=False)
     
     # New tracking fields
-    tracking_vendor = models.CharField(max_length=10, choices=TRACKING_VENDOR_CHOICES, blank=True, default='')
+    tracking_vendor = CompactChoiceField(choices=TRACKING_VENDOR_CHOICES, blank=True, default='')
     tracking_status = models.CharField(max_length=100, blank=True, default='')  # Current tracking status
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PackingSlipQuerySet.as_manager()
+
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            # Status-filtered lists in the default (newest first) order
+            models.Index(fields=['status', '-created_at'], name='ps_status_created_idx'),
+            # Prefix lookups when matching uploads to packing slips by Drive folder path;
+            # blank (manual) rows are left out of the index
+            models.Index(
+                fields=['folder_path'],
+                name='ps_folderpath_prefix',
+                condition=~models.Q(folder_path=''),
+                opclasses=['text_pattern_ops'],
+            ),
+            # The tracking updater's scan; only the few shipped-but-undelivered rows are indexed,
+            # and carrying id lets its values_list('id', 'tracking_vendor') read the index alone
+            models.Index(fields=['tracking_vendor', 'id'], name='ps_pending_tracking_idx', condition=PENDING_TRACKING),
+        ]
+        # Mirror the serializer validation so rows written outside the API stay sane
+        constraints = [
+            models.CheckConstraint(condition=models.Q(quantity__gt=0), name='ps_qty_pos'),
+            models.CheckConstraint(
+                condition=models.Q(sales_price__gte=0, shipping_price__gte=0, item_cost__gte=0, shipping_cost__gte=0),
+                name='ps_money_nonneg',
+            ),
+            models.CheckConstraint(
+                condition=models.Q(platform_fee_percent__gte=0, platform_fee_percent__lte=100),
+                name='ps_fee_pct_range',
+            ),
+        ]
 
     def __str__(self):
-        return f"Order {self.order_id} - {self.product.code}"
+        # Don't trigger a product query per row when the slip was loaded without with_product()
+        product_code = self.product.code if PackingSlip.product.is_cached(self) else self.product_id
+        return f"Order {self.order_id} - {product_code}"
+    
+    @property
+    def tracking_numbers(self):
+        """Tracking IDs parsed from the comma-separated tracking_ids field"""
+        if not self.tracking_ids:
+            return []
+        return [tid.strip() for tid in self.tracking_ids.split(',') if tid.strip()]
+    
+    # Fields that feed the platform fee / profit calculation, and the fields it writes
+    FINANCIAL_INPUT_FIELDS = frozenset({
+        'product', 'product_id', 'sales_price', 'shipping_price', 'item_cost',
+        'shipping_cost', 'platform_fee_percent',
+    })
+    FINANCIAL_COMPUTED_FIELDS = ('item_cost', 'sales_price', 'platform_fee_calculated', 'profit')
     
     def save(self, *args, **kwargs):
         """Override save method to auto-populate item_cost, sales_price and calculate fields"""
-        # Auto-populate item_cost and sales_price from product if not already set
-        if self.product:
-            if not self.item_cost or self.item_cost == 0:
-                self.item_cost = self.product.sku_buy_cost
-            if not self.sales_price or self.sales_price == 0:
-                self.sales_price = self.product.sku_price
+        # Slips loaded with only()/defer() without tracking_ids can't have changed it
+        if 'tracking_ids' not in self.get_deferred_fields():
+            self.sync_primary_tracking_id()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'tracking_ids' in update_fields:
+                update_fields.add('primary_tracking_id')
+                kwargs['update_fields'] = update_fields
+            # Status/tracking-only saves don't touch money fields: skip the recalculation
+            if not update_fields & self.FINANCIAL_INPUT_FIELDS:
+                return super().save(*args, **kwargs)
+            # Persist the recalculated values alongside the changed inputs
+            kwargs['update_fields'] = update_fields.union(self.FINANCIAL_COMPUTED_FIELDS)
+        
+        # Auto-populate item_cost and sales_price from product if not already set.
+        # Only touch the product when a price is missing, so saving an existing
+        # slip doesn't cost an extra product SELECT.
+        if self.product_id and (not self.item_cost or not self.sales_price):
+            self.populate_prices(self._get_product_prices())
         
         # Calculate platform fee
         self.calculate_platform_fee()
@@ -101,17 +220,60 @@ class PackingSlip(models.Model):
         
         super().save(*args, **kwargs)
     
+    def _get_product_prices(self):
+        """Return (sku_buy_cost, sku_price) for the slip's product, reusing a loaded product if there is one"""
+        if PackingSlip.product.is_cached(self):
+            product = self.product
+            return product.sku_buy_cost, product.sku_price
+        return _product_costs(self.product_id)
+    
+    def populate_prices(self, prices):
+        """Fill item_cost / sales_price from (sku_buy_cost, sku_price) where not already set"""
+        sku_buy_cost, sku_price = prices
+        if not self.item_cost:
+            self.item_cost = sku_buy_cost
+        if not self.sales_price:
+            self.sales_price = sku_price
+    
+    @classmethod
+    def bulk_create_with_calc(cls, slips, **kwargs):
+        """
+        bulk_create packing slips with the same price population and fee/profit
+        calculation as save(), loading all product prices in one query.
+        Note that bulk_create bypasses save(), so this is the way to insert
+        computed slips in bulk.
+        """
+        slips = list(slips)
+        product_ids = {slip.product_id for slip in slips if slip.product_id}
+        prices = {
+            pk: (sku_buy_cost, sku_price)
+            for pk, sku_buy_cost, sku_price in Product.objects.filter(pk__in=product_ids)
+            .values_list('pk', 'sku_buy_cost', 'sku_price')
+        }
+        for slip in slips:
+            if slip.product_id in prices:
+                slip.populate_prices(prices[slip.product_id])
+            slip.sync_primary_tracking_id()
+            slip.calculate_platform_fee()
+            slip.calculate_profit()
+        return cls.objects.bulk_create(slips, **kwargs)
+    
+    def sync_primary_tracking_id(self):
+        """Set primary_tracking_id from the first of the tracking IDs ('' when there are none)"""
+        tracking_numbers = self.tracking_numbers
+        self.primary_tracking_id = tracking_numbers[0][:64] if tracking_numbers else ''
+    
     def calculate_platform_fee(self):
         """Calculate platform fee based on sales price and percentage"""
         if self.sales_price and self.platform_fee_percent:
-            self.platform_fee_calculated = (self.sales_price * self.platform_fee_percent) / 100
+            self.platform_fee_calculated = (self.sales_price * self.platform_fee_percent) / HUNDRED
         else:
-            self.platform_fee_calculated = 0.00
+            self.platform_fee_calculated = ZERO
     
     def calculate_profit(self):
         """Calculate profit: sales_price + shipping_price - item_cost - shipping_cost - platform_fee_calculated"""
-        total_revenue = (self.sales_price or 0) + (self.shipping_price or 0)
-        total_costs = (self.item_cost or 0) + (self.shipping_cost or 0) + (self.platform_fee_calculated or 0)
+        total_revenue = (self.sales_price or ZERO) + (self.shipping_price or ZERO)
+        total_costs = (self.item_cost or ZERO) + (self.shipping_cost or ZERO) + (self.platform_fee_calculated or ZERO)
         self.profit = total_revenue - total_costs
 
 
@@ -127,14 +289,32 @@ class File(models.Model):
     file_type = models.CharField(max_length=20, choices=FILE_TYPES)
     file_path = models.CharField(max_length=1000)  # Google Drive file link
     page_number = models.IntegerField(null=True, blank=True)  # Page number for shipping labels
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
 
     class Meta:
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=['packing_slip', 'file_type'], name='file_ps_type_idx'),
+        ]
 
     def __str__(self):
         page_info = f" (Page {self.page_number})" if self.page_number else ""
-        return f"{self.get_file_type_display()} - {self.file_path}{page_info}"
+        return f"{FILE_TYPE_LABELS.get(self.file_type, self.file_type)} - {self.file_path}{page_info}"
+
+
+class TrackingDeadLetter(models.Model):
+    """A packing slip whose tracking update kept failing, parked for a manual re-queue"""
+    packing_slip = models.OneToOneField(PackingSlip, on_delete=models.CASCADE, related_name='tracking_dead_letter')
+    courier_code = models.CharField(max_length=20)
+    error = models.TextField()
+    attempts = models.PositiveSmallIntegerField()
+    last_attempted_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("-last_attempted_at",)
+
+    def __str__(self):
+        return f"Packing slip {self.packing_slip_id} - {self.error}"
 
 
 class Expense(models.Model):
@@ -156,11 +336,38 @@ class Expense(models.Model):
     date = models.DateField()
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     description = models.TextField(blank=True, default='')
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(db_default=Now(), editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ("-date", "-created_at")
+        indexes = [
+            models.Index(fields=['account', '-date'], name='exp_acct_date_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.account.account_name} - {self.get_expense_type_display()} - ${self.amount}"
+        return f"{self.account.account_name} - {EXPENSE_TYPE_LABELS.get(self.expense_type, self.expense_type)} - ${self.amount}"
+
+
+def _product_costs(product_id):
+    """(sku_buy_cost, sku_price) for a product, cached per process"""
+    with _product_costs_lock:
+        costs = _product_costs_cache.get(product_id)
+    if costs is None:
+        costs = Product.objects.values_list('sku_buy_cost', 'sku_price').get(pk=product_id)
+        with _product_costs_lock:
+            _product_costs_cache[product_id] = costs
+    return costs
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def _clear_product_costs(sender, instance, **kwargs):
+    with _product_costs_lock:
+        _product_costs_cache.pop(instance.pk, None)
+
+
+# Choice code -> label lookups for hot display paths (get_FOO_display() scans the choices each call)
+STATUS_LABELS = dict(PackingSlip.STATUS_CHOICES)
+FILE_TYPE_LABELS = dict(File.FILE_TYPES)
+EXPENSE_TYPE_LABELS = dict(Expense.EXPENSE_TYPE_CHOICES)
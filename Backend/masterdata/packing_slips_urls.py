@@ -0,0 +1,18 @@
+from django.urls import path
+from .views import (
+    PackingSlipsUploadView,
+    PackingSlipsViewSet,
+    PackingSlipPrintView,
+    PackingSlipFetchTrackingStatusView
+)
+
+# Included under packing-slips/; the list route itself has no trailing slash
+# and stays in masterdata/urls.py
+urlpatterns = [
+    path('<int:pk>', PackingSlipsViewSet.as_view({'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}), name='packing-slips-detail'),
+    path('<int:pk>/files', PackingSlipsViewSet.as_view({'post': 'add_file'}), name='packing-slips-add-file'),
+    path('<int:pk>/files/<int:file_id>', PackingSlipsViewSet.as_view({'delete': 'delete_file'}), name='packing-slips-delete-file'),
+    path('upload/', PackingSlipsUploadView.as_view(), name='packing-slips-upload'),
+    path('print/', PackingSlipPrintView.as_view(), name='packing-slip-print'),
+    path('<int:packing_slip_id>/fetch-tracking-status/', PackingSlipFetchTrackingStatusView.as_view(), name='packing-slip-fetch-tracking-status'),
+]
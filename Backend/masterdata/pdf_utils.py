@@ -12,13 +12,32 @@ Different carriers have different label layouts, so carrier-specific
 pattern matching is used for optimal address extraction.
 """
 
+import logging
 import os
+import queue
 import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, FrozenSet, Iterator, Tuple, Optional
 import re
 from difflib import SequenceMatcher
 
+logger = logging.getLogger(__name__)
+
+try:
+    # C++ implementation of the same 0-100 similarity ratio
+    from rapidfuzz import fuzz
+except ImportError:
+    fuzz = None
+
+
+def _similarity_ratio(a: str, b: str) -> float:
+    """Similarity of two strings in [0, 1]: rapidfuzz when installed, else difflib"""
+    if fuzz is not None:
+        return fuzz.ratio(a, b) / 100.0
+    return SequenceMatcher(None, a, b).ratio()
+
 try:
     # Option 1: PyMuPDF (simpler setup, no poppler needed)
     import fitz  # PyMuPDF
@@ -32,17 +51,156 @@ except ImportError:
         # Option 2: Original approach with pdf2image
         import PyPDF2
         from PIL import Image
-        from pdf2image import convert_from_path
+        from pdf2image import convert_from_path, pdfinfo_from_path
         import pytesseract
         import cv2
         import numpy as np
         PDF_LIBRARY = "pdf2image"
     except ImportError as e:
-        print(f"Missing required packages: {e}")
-        print("Install PyMuPDF (easier): pip install PyMuPDF pytesseract opencv-python")
-        print("OR install pdf2image: pip install PyPDF2 Pillow pdf2image pytesseract opencv-python")
+        logger.warning(
+            "Missing required packages: %s. Install PyMuPDF (easier): pip install PyMuPDF pytesseract opencv-python "
+            "OR install pdf2image: pip install PyPDF2 Pillow pdf2image pytesseract opencv-python", e
+        )
         PDF_LIBRARY = None
 
+# Pages are OCR'd concurrently, one tesseract process per worker thread; keep
+# each of those single-threaded so they don't oversubscribe the cores.
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+try:
+    # Optional in-process tesseract binding (needs libtesseract to build); when
+    # installed, pages are OCR'd without forking tesseract or reloading its model
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+# Idle tesserocr API handles, reused across PDFs; each worker thread takes one (they aren't thread-safe)
+_tess_apis = queue.SimpleQueue()
+OCR_WORKERS = os.cpu_count() or 1
+# Pages per tesseract run when batching through a list file
+OCR_BATCH_PAGES = 4
+OCR_CONFIG = r'--oem 3 --psm 6'
+# Page render zoom (1.0 = 72 DPI). Labels use large print, so 2x (144 DPI)
+# grayscale is enough for tesseract and much less data than 3x RGB
+RENDER_SCALE = float(os.environ.get('SHIPPING_LABEL_RENDER_SCALE', '2.0'))
+# Digitally generated labels carry a text layer; use it instead of OCR when it
+# has at least this many characters and names a carrier
+TEXT_LAYER_MIN_CHARS = 40
+# Rendered pages stay in memory; set this to a directory to also save them as PNGs for debugging
+DEBUG_PAGES_DIR = os.environ.get('SHIPPING_LABEL_DEBUG_DIR')
+
+# Regexes used per page / per packing slip, compiled once at import.
+# The address patterns run against upper-cased text, so they're written in
+# upper case and skip IGNORECASE.
+_ADDRESS_FLAGS = re.DOTALL | re.MULTILINE
+
+
+def _compile_address_patterns(*patterns):
+    return tuple(re.compile(pattern, _ADDRESS_FLAGS) for pattern in patterns)
+
+
+# UPS address extraction patterns, tried in order
+_UPS_PATTERNS = _compile_address_patterns(
+    # UPS Pattern 1: After "SHIP TO:" until next section (UPS GROUND, TRACKING, barcode)
+    r'SHIP\s*TO\s*:?\s*(.*?)(?=\n\s*(?:UPS|TRACKING|CA \d{3}|1Z)|\Z)',
+
+    # UPS Pattern 2: Name, street, city/state/zip before UPS GROUND
+    r'([A-Z][A-Z\s]{3,}[^\n]*\n\d+[^\n]+\n[^\n]*[A-Z]{2}\s+\d{5}(?:-\d{4})?)',
+
+    # UPS Pattern 3: Between SHIP TO and barcode/tracking area
+    r'SHIP\s*TO\s*:?\s*([^\n]+\n[^\n]+\n[^\n]+[A-Z]{2}\s+\d{5})',
+
+    # UPS Pattern 4: Everything after "TO:" before UPS markers
+    r'(?:^|\n)\s*TO\s*:?\s*(.*?)(?=\n\s*(?:UPS|TRACKING|CA \d{3}))',
+)
+
+# FedEx address extraction patterns, tried in order
+_FEDEX_PATTERNS = _compile_address_patterns(
+    # FedEx Pattern 1: After "TO" at the start, before REF/DEPT/PO
+    r'(?:^|\n)\s*TO\s+([A-Z][^\n]+\n[^\n]*\d+[^\n]+\n[^\n]*[A-Z]{2}\s+\d{5})',
+
+    # FedEx Pattern 2: Name on one line, then address components
+    r'(?:^|\n)([A-Z][A-Z\s]{5,}[^\n]*\n\d+[^\n]+\n[^\n]*[A-Z]{2}\s+\d{5})',
+
+    # FedEx Pattern 3: Between "TO" and other fields (REF, DEPT, PO)
+    r'TO\s+(.*?)(?=\n\s*(?:REF|DEPT|PO|TRACKING))',
+
+    # FedEx Pattern 4: Look for pattern with street number and ZIP
+    r'([A-Z][A-Z\s]{3,}[^\n]*\n[^\n]*\d+[^\n]*(?:ST|DR|AVE|RD|BLVD|LN)[^\n]*\n[^\n]*[A-Z]{2}\s+\d{5})',
+
+    # FedEx Pattern 5: Simple name-street-city pattern
+    r'([A-Z][A-Z\s]+[^\n]{5,}\n\d+[^\n]+\n[A-Z\s]+[A-Z]{2}\s+\d{5})',
+)
+
+# USPS address extraction patterns, tried in order
+_USPS_PATTERNS = _compile_address_patterns(
+    # USPS Pattern 1: Everything after "SHIP TO:" until next section
+    r'SHIP\s*TO\s*:?\s*(.*?)(?=\n\s*(?:USPS|TRACKING|PRIORITY|FROM|DELIVERY|RETURN|SERVICE)|\Z)',
+
+    # USPS Pattern 2: Everything after "TO:" 
+    r'(?:^|\n)\s*TO\s*:?\s*(.*?)(?=\n\s*(?:USPS|TRACKING|PRIORITY|FROM|DELIVERY|RETURN|SERVICE)|\Z)',
+
+    # USPS Pattern 3: Simple 3-line address (most common)
+    r'([A-Z][^\n]{8,}\n[^\n]*\d+[^\n]{5,}\n[^\n]*[A-Z]{2}\s+\d{5})',
+
+    # USPS Pattern 4: Any text block with name, street number, and ZIP
+    r'([A-Z][A-Z\s]{3,}[^\n]*\n.*?\d+.*?\n.*?[A-Z]{2}\s+\d{5}(?:-\d{4})?)',
+)
+
+# Carrier-independent fallbacks, tried after the carrier patterns
+_COMMON_PATTERNS = _compile_address_patterns(
+    # Pattern: Flexible address with ZIP (work backwards from ZIP)
+    r'([^\n]*\n[^\n]*\n[^\n]*[A-Z]{2}\s+\d{5}(?:-\d{4})?)',
+
+    # Pattern: Very loose - any multi-line text with numbers and letters
+    r'([A-Z][^\n]{10,}\n[^\n]{10,}\n[^\n]{10,})',
+)
+
+# Carrier indicators as one alternation, so a label is classified in a single
+# scan. The groups are checked in priority order (UPS, FedEx, USPS) afterwards.
+_CARRIER_RE = re.compile(
+    r'(?P<UPS>UPS GROUND|UPS EXPRESS|UPS NEXT DAY|UPS 2ND DAY|TRACKING #: 1Z)'
+    r'|(?P<FEDEX>FEDEX|SS LBBA|TX-US LBB)'
+    r'|(?P<USPS>USPS|PRIORITY MAIL|US POSTAL)',
+    re.IGNORECASE,
+)
+_CARRIER_PRIORITY = ('UPS', 'FEDEX', 'USPS')
+
+_WS_RE = re.compile(r'\s+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_LETTER_RE = re.compile(r'[A-Za-z]')
+_NUMS_RE = re.compile(r'\b\d+\b')
+_ZIP_RE = re.compile(r'\b\d{5}(?:-\d{4})?\b')
+_FEDEX_ARTIFACTS_RE = re.compile(r'(?i)(REF|DEPT|PO|TRACKING).*', re.MULTILINE)
+_UPS_ARTIFACTS_RE = re.compile(r'(?i)(UPS GROUND|UPS EXPRESS|TRACKING #|CA \d{3}|1Z).*', re.MULTILINE)
+
+
+
+def _normalize_text(text: str) -> str:
+    """Lowercase, turn punctuation into spaces and collapse whitespace"""
+    return _WS_RE.sub(' ', _PUNCT_RE.sub(' ', text.lower())).strip()
+
+
+def _address_components(packing_address: str) -> List[Tuple[str, str, Tuple[str, ...]]]:
+    """(line, normalized line, words longer than 2 chars) for each non-blank address line"""
+    components = []
+    for line in packing_address.split('\n'):
+        line = line.strip()
+        if line:
+            line_normalized = _normalize_text(line)
+            components.append((line, line_normalized, tuple(w for w in line_normalized.split() if len(w) > 2)))
+    return components
+
+
+def _max_address_score(components: List[Tuple[str, str, Tuple[str, ...]]]) -> float:
+    """Highest score check_address_in_ocr can give these components (every line found whole)"""
+    if not components:
+        return 0.0
+    weights = (0.6 if i == 0 else 0.4 for i, (_, line_normalized, _) in enumerate(components)
+               if len(line_normalized) >= 3)
+    return sum(weights) / len(components)
+
 
 class PDFProcessor:
     """Handles PDF processing for shipping labels"""
@@ -50,219 +208,239 @@ class PDFProcessor:
     def __init__(self):
         self.temp_dir = tempfile.mkdtemp()
     
-    def extract_pages_from_pdf(self, pdf_path: str) -> List[str]:
+    def extract_pages_from_pdf(self, pdf_path: str) -> Iterator[Tuple[Optional[str], Optional["np.ndarray"]]]:
         """
-        Split PDF into individual pages and return list of image paths
+        Split PDF into individual pages, lazily, one page at a time. Each page is
+        yielded as (text, None) when its text layer is usable, otherwise as
+        (None, grayscale image array) to be OCR'd
         """
-        try:
-            if PDF_LIBRARY == "pymupdf":
-                return self._extract_pages_pymupdf(pdf_path)
-            elif PDF_LIBRARY == "pdf2image":
-                return self._extract_pages_pdf2image(pdf_path)
-            else:
-                print("❌ No PDF library available. Please install PyMuPDF or pdf2image")
-                print("Run: pip install PyMuPDF pytesseract opencv-python")
-                raise Exception("No PDF library available. Install PyMuPDF: pip install PyMuPDF pytesseract opencv-python")
-        except Exception as e:
-            print(f"Error extracting pages from PDF: {str(e)}")
-            return []
+        if PDF_LIBRARY == "pymupdf":
+            return self._iter_pages_pymupdf(pdf_path)
+        elif PDF_LIBRARY == "pdf2image":
+            return self._iter_pages_pdf2image(pdf_path)
+        logger.error("Error extracting pages from PDF: No PDF library available. "
+                     "Install PyMuPDF: pip install PyMuPDF pytesseract opencv-python")
+        return iter(())
     
-    def _extract_pages_pymupdf(self, pdf_path: str) -> List[str]:
+    def _iter_pages_pymupdf(self, pdf_path: str) -> Iterator[Tuple[Optional[str], Optional["np.ndarray"]]]:
         """Extract pages using PyMuPDF (no poppler needed)"""
-        page_paths = []
-        doc = fitz.open(pdf_path)
+        with fitz.open(pdf_path) as doc:
+            for page_num in range(len(doc)):
+                page = doc.load_page(page_num)
+                
+                # Digital labels: read the embedded text and skip rendering + OCR
+                text = page.get_text("text")
+                if len(text.strip()) >= TEXT_LAYER_MIN_CHARS and _CARRIER_RE.search(text):
+                    logger.debug("Page %s: using embedded text layer", page_num + 1)
+                    yield text.strip(), None
+                    continue
+                
+                # Render straight to single-channel grayscale; no colour conversion needed later
+                mat = fitz.Matrix(RENDER_SCALE, RENDER_SCALE)
+                pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+                
+                # View the pixmap's samples as an array instead of PNG-encoding it
+                image = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+                self._save_debug_page(page_num + 1, image)
+                yield None, image
+    
+    def _iter_pages_pdf2image(self, pdf_path: str) -> Iterator[Tuple[Optional[str], Optional["np.ndarray"]]]:
+        """Extract pages using pdf2image (requires poppler); every page is OCR'd"""
+        # Render page by page so only one page image is held at a time
+        page_count = pdfinfo_from_path(pdf_path)['Pages']
+        for page_num in range(1, page_count + 1):
+            page = convert_from_path(
+                pdf_path, dpi=int(72 * RENDER_SCALE), grayscale=True, first_page=page_num, last_page=page_num
+            )[0]
+            image = np.asarray(page.convert('L'))
+            self._save_debug_page(page_num, image)
+            yield None, image
+    
+    def _save_debug_page(self, page_num: int, image) -> None:
+        """Write a rendered page to DEBUG_PAGES_DIR, if set"""
+        if DEBUG_PAGES_DIR:
+            os.makedirs(DEBUG_PAGES_DIR, exist_ok=True)
+            cv2.imwrite(os.path.join(DEBUG_PAGES_DIR, f"page_{page_num}.png"), image)
+    
+    def preprocess_image(self, image):
+        """
+        Binarize a page image for OCR. Accepts a grayscale array (as rendered by
+        extract_pages_from_pdf), an RGB array or an image file path; returns
+        None if the file can't be read
+        """
+        if isinstance(image, str):
+            image_path = image
+            image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
+            if image is None:
+                logger.debug("Failed to load image: %s", image_path)
+                return None
         
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            # Convert to image with high DPI for better OCR
-            mat = fitz.Matrix(3.0, 3.0)  # 3x zoom = ~216 DPI
-            pix = page.get_pixmap(matrix=mat)
-            
-            page_path = os.path.join(self.temp_dir, f"page_{page_num+1}.png")
-            pix.save(page_path)
-            page_paths.append(page_path)
+        logger.debug("Image loaded successfully, shape: %s", image.shape)
         
-        doc.close()
-        return page_paths
-    
-    def _extract_pages_pdf2image(self, pdf_path: str) -> List[str]:
-        """Extract pages using pdf2image (requires poppler)"""
-        pages = convert_from_path(pdf_path, dpi=300)
-        page_paths = []
+        # Grayscale for better OCR (rendered pages already are)
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
         
-        for i, page in enumerate(pages):
-            page_path = os.path.join(self.temp_dir, f"page_{i+1}.png")
-            page.save(page_path, 'PNG')
-            page_paths.append(page_path)
+        # Apply some preprocessing for better OCR results
+        # Increase contrast
+        alpha = 1.5  # Contrast control
+        beta = 0     # Brightness control
+        enhanced = cv2.convertScaleAbs(gray, alpha=alpha, beta=beta)
         
-        return page_paths
+        # Apply threshold to get better text recognition
+        _, thresh = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        
+        logger.debug("Image preprocessing completed")
+        return thresh
     
-    def extract_text_from_image(self, image_path: str) -> str:
+    def _ocr(self, thresh) -> str:
+        """Run tesseract on one binarized image"""
+        if tesserocr is None:
+            return pytesseract.image_to_string(thresh, config=OCR_CONFIG)
+        try:
+            api = _tess_apis.get_nowait()
+        except queue.Empty:
+            # Same settings as OCR_CONFIG: --oem 3 --psm 6
+            api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_BLOCK, oem=tesserocr.OEM.DEFAULT)
+        try:
+            api.SetImage(Image.fromarray(thresh))
+            return api.GetUTF8Text()
+        finally:
+            _tess_apis.put(api)
+    
+    def extract_text_from_image(self, image) -> str:
         """
-        Extract text from image using OCR
+        Extract text from image (array or file path) using OCR
         """
         try:
-            print(f"=== OCR PROCESSING ===")
-            print(f"Processing image: {image_path}")
+            logger.debug("=== OCR PROCESSING ===")
             
-            # Load image
-            image = cv2.imread(image_path)
-            if image is None:
-                print(f"Failed to load image: {image_path}")
+            thresh = self.preprocess_image(image)
+            if thresh is None:
                 return ""
             
-            print(f"Image loaded successfully, shape: {image.shape}")
-            
-            # Convert to grayscale for better OCR
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Apply some preprocessing for better OCR results
-            # Increase contrast
-            alpha = 1.5  # Contrast control
-            beta = 0     # Brightness control
-            enhanced = cv2.convertScaleAbs(gray, alpha=alpha, beta=beta)
-            
-            # Apply threshold to get better text recognition
-            _, thresh = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            
-            print("Image preprocessing completed")
-            
             # Use pytesseract to extract text with optimized config for shipping labels
             # Removed whitelist to better capture FedEx and USPS labels
-            custom_config = r'--oem 3 --psm 6'
-            text = pytesseract.image_to_string(thresh, config=custom_config)
+            text = self._ocr(thresh)
             
-            print(f"OCR completed, extracted text length: {len(text)}")
-            print(f"Raw OCR text (first 500 chars):\n{text[:500]}")
-            if len(text) > 500:
-                print(f"... (truncated, total length: {len(text)} chars)")
+            logger.debug("OCR completed, extracted text length: %s", len(text))
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw OCR text (first 500 chars):\n%s", text[:500])
+                if len(text) > 500:
+                    logger.debug("... (truncated, total length: %s chars)", len(text))
             
             return text.strip()
             
         except Exception as e:
-            print(f"Error extracting text from image: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error extracting text from image: %s", e)
             return ""
     
+    def _batch_ocr(self, pages: List[Tuple[int, "np.ndarray"]]) -> List[str]:
+        """
+        OCR several (page_number, image) pages with a single tesseract run (one
+        model load) by passing it a list file. Returns one text per page, in order.
+        With tesserocr the pages go through the worker's loaded API handle instead.
+        """
+        images = [image for _, image in pages]
+        if tesserocr is not None:
+            return [self.extract_text_from_image(image) for image in images]
+        try:
+            # The list mode reads from disk, so only the binarized images are written out,
+            # as uncompressed PGM (no deflate on write or inflate in tesseract)
+            list_lines = []
+            for page_num, image in pages:
+                prepped_path = os.path.join(self.temp_dir, f"page_{page_num}_ocr.pgm")
+                cv2.imwrite(prepped_path, self.preprocess_image(image))
+                list_lines.append(prepped_path)
+            
+            list_path = os.path.join(self.temp_dir, f"batch_{pages[0][0]}.txt")
+            with open(list_path, 'w') as f:
+                f.write('\n'.join(list_lines) + '\n')
+            
+            # tesseract ends every page's text with a form feed
+            output = pytesseract.image_to_string(list_path, config=OCR_CONFIG)
+            texts = output.split('\f')[:len(pages)]
+            if len(texts) != len(pages):
+                logger.warning("Batch OCR returned %s page(s) for %s image(s), falling back to per-page OCR", len(texts), len(pages))
+                return [self.extract_text_from_image(image) for image in images]
+            
+            logger.debug("Batch OCR completed for %s page(s)", len(pages))
+            return [text.strip() for text in texts]
+            
+        except Exception as e:
+            logger.exception("Error in batch OCR: %s", e)
+            return [self.extract_text_from_image(image) for image in images]
+    
     def detect_label_type(self, text: str) -> str:
         """
         Detect if this is a USPS, FedEx, or UPS label
         """
-        text_upper = text.upper()
-        
-        # Check for UPS indicators (check first as it's very specific)
-        if any(indicator in text_upper for indicator in ['UPS GROUND', 'UPS EXPRESS', 'UPS NEXT DAY', 'UPS 2ND DAY', 'TRACKING #: 1Z']):
-            print("📦 Detected: UPS label")
-            return 'UPS'
+        carriers_found = {match.lastgroup for match in _CARRIER_RE.finditer(text)}
         
-        # Check for FedEx indicators
-        if any(indicator in text_upper for indicator in ['FEDEX', 'FEDEX EXPRESS', 'FEDEX GROUND', 'SS LBBA', 'TX-US LBB']):
-            print("📦 Detected: FedEx label")
-            return 'FEDEX'
-        
-        # Check for USPS indicators
-        if any(indicator in text_upper for indicator in ['USPS', 'PRIORITY MAIL', 'US POSTAL']):
-            print("📦 Detected: USPS label")
-            return 'USPS'
+        # UPS indicators win (they're very specific), then FedEx, then USPS
+        for carrier in _CARRIER_PRIORITY:
+            if carrier in carriers_found:
+                logger.debug("📦 Detected: %s label", carrier)
+                return carrier
         
         # Default to USPS if can't determine
-        print("📦 Unable to detect carrier, defaulting to USPS")
+        logger.debug("📦 Unable to detect carrier, defaulting to USPS")
         return 'USPS'
     
-    def extract_shipping_address(self, text: str) -> str:
+    def extract_shipping_address(self, text: str, label_type: Optional[str] = None) -> str:
         """
         Extract shipping address from OCR text using pattern matching
         Handles USPS, FedEx, and UPS label formats
+        Pass label_type if it's already known to skip re-detecting it
         """
         try:
-            print(f"=== EXTRACTING ADDRESS FROM TEXT ===")
-            print(f"Raw OCR text:\n{text}")
-            print("=" * 50)
+            logger.debug("=== EXTRACTING ADDRESS FROM TEXT ===")
+            logger.debug("Raw OCR text:\n%s", text)
             
             # Detect label type
-            label_type = self.detect_label_type(text)
+            if label_type is None:
+                label_type = self.detect_label_type(text)
             
             # Define patterns based on label type
             if label_type == 'UPS':
-                print("Using UPS-specific address extraction patterns")
-                address_patterns = [
-                    # UPS Pattern 1: After "SHIP TO:" until next section (UPS GROUND, TRACKING, barcode)
-                    r'SHIP\s*TO\s*:?\s*(.*?)(?=\n\s*(?:UPS|TRACKING|CA \d{3}|1Z)|\Z)',
-                    
-                    # UPS Pattern 2: Name, street, city/state/zip before UPS GROUND
-                    r'([A-Z][A-Z\s]{3,}[^\n]*\n\d+[^\n]+\n[^\n]*[A-Z]{2}\s+\d{5}(?:-\d{4})?)',
-                    
-                    # UPS Pattern 3: Between SHIP TO and barcode/tracking area
-                    r'SHIP\s*TO\s*:?\s*([^\n]+\n[^\n]+\n[^\n]+[A-Z]{2}\s+\d{5})',
-                    
-                    # UPS Pattern 4: Everything after "TO:" before UPS markers
-                    r'(?:^|\n)\s*TO\s*:?\s*(.*?)(?=\n\s*(?:UPS|TRACKING|CA \d{3}))',
-                ]
+                logger.debug("Using UPS-specific address extraction patterns")
+                address_patterns = _UPS_PATTERNS
             elif label_type == 'FEDEX':
-                print("Using FedEx-specific address extraction patterns")
-                address_patterns = [
-                    # FedEx Pattern 1: After "TO" at the start, before REF/DEPT/PO
-                    r'(?:^|\n)\s*TO\s+([A-Z][^\n]+\n[^\n]*\d+[^\n]+\n[^\n]*[A-Z]{2}\s+\d{5})',
-                    
-                    # FedEx Pattern 2: Name on one line, then address components
-                    r'(?:^|\n)([A-Z][A-Z\s]{5,}[^\n]*\n\d+[^\n]+\n[^\n]*[A-Z]{2}\s+\d{5})',
-                    
-                    # FedEx Pattern 3: Between "TO" and other fields (REF, DEPT, PO)
-                    r'TO\s+(.*?)(?=\n\s*(?:REF|DEPT|PO|TRACKING))',
-                    
-                    # FedEx Pattern 4: Look for pattern with street number and ZIP
-                    r'([A-Z][A-Z\s]{3,}[^\n]*\n[^\n]*\d+[^\n]*(?:ST|DR|AVE|RD|BLVD|LN)[^\n]*\n[^\n]*[A-Z]{2}\s+\d{5})',
-                    
-                    # FedEx Pattern 5: Simple name-street-city pattern
-                    r'([A-Z][A-Z\s]+[^\n]{5,}\n\d+[^\n]+\n[A-Z\s]+[A-Z]{2}\s+\d{5})',
-                ]
+                logger.debug("Using FedEx-specific address extraction patterns")
+                address_patterns = _FEDEX_PATTERNS
             else:  # USPS patterns
-                print("Using USPS address extraction patterns")
-                address_patterns = [
-                    # USPS Pattern 1: Everything after "SHIP TO:" until next section
-                    r'SHIP\s*TO\s*:?\s*(.*?)(?=\n\s*(?:USPS|TRACKING|PRIORITY|FROM|Delivery|Return|Service)|\Z)',
-                    
-                    # USPS Pattern 2: Everything after "TO:" 
-                    r'(?:^|\n)\s*TO\s*:?\s*(.*?)(?=\n\s*(?:USPS|TRACKING|PRIORITY|FROM|Delivery|Return|Service)|\Z)',
-                    
-                    # USPS Pattern 3: Simple 3-line address (most common)
-                    r'([A-Za-z][^\n]{8,}\n[^\n]*\d+[^\n]{5,}\n[^\n]*[A-Z]{2}\s+\d{5})',
-                    
-                    # USPS Pattern 4: Any text block with name, street number, and ZIP
-                    r'([A-Za-z][A-Za-z\s]{3,}[^\n]*\n.*?\d+.*?\n.*?[A-Z]{2}\s+\d{5}(?:-\d{4})?)',
-                ]
+                logger.debug("Using USPS address extraction patterns")
+                address_patterns = _USPS_PATTERNS
             
             # Common patterns that work for both
-            common_patterns = [
-                # Pattern: Flexible address with ZIP (work backwards from ZIP)
-                r'([^\n]*\n[^\n]*\n[^\n]*[A-Z]{2}\s+\d{5}(?:-\d{4})?)',
-                
-                # Pattern: Very loose - any multi-line text with numbers and letters
-                r'([A-Za-z][^\n]{10,}\n[^\n]{10,}\n[^\n]{10,})',
-            ]
+            common_patterns = _COMMON_PATTERNS
             
             # Combine patterns
             all_patterns = address_patterns + common_patterns
             
+            # Upper-case once for the (case-sensitive) patterns; the address is then
+            # sliced from the original text to keep its casing, unless upper() changed
+            # the length (some non-ASCII letters expand) and the offsets don't line up
+            text_upper = text.upper()
+            source_text = text if len(text_upper) == len(text) else text_upper
+            
             for i, pattern in enumerate(all_patterns, 1):
-                print(f"Trying pattern {i}: {pattern[:80]}...")
-                match = re.search(pattern, text, re.DOTALL | re.MULTILINE | re.IGNORECASE)
+                logger.debug("Trying pattern %s: %s...", i, pattern.pattern[:80])
+                match = pattern.search(text_upper)
                 if match:
-                    address = match.group(1).strip()
-                    print(f"Pattern {i} matched: '{address}'")
+                    address = source_text[match.start(1):match.end(1)].strip()
+                    logger.debug("Pattern %s matched: '%s'", i, address)
                     
                     # Clean up the address
-                    address = re.sub(r'\s+', ' ', address)  # Multiple spaces to single
-                    address = re.sub(r'\n\s*\n', '\n', address)  # Multiple newlines to single
+                    address = _WS_RE.sub(' ', address)  # Multiple spaces to single
+                    address = _BLANK_LINES_RE.sub('\n', address)  # Multiple newlines to single
                     
                     # Remove common label artifacts based on carrier
                     if label_type == 'FEDEX':
                         # Remove FedEx-specific artifacts
-                        address = re.sub(r'(?i)(REF|DEPT|PO|TRACKING).*', '', address, flags=re.MULTILINE)
+                        address = _FEDEX_ARTIFACTS_RE.sub('', address)
                     elif label_type == 'UPS':
                         # Remove UPS-specific artifacts
-                        address = re.sub(r'(?i)(UPS GROUND|UPS EXPRESS|TRACKING #|CA \d{3}|1Z).*', '', address, flags=re.MULTILINE)
+                        address = _UPS_ARTIFACTS_RE.sub('', address)
                     
                     address = address.strip()
                     
@@ -270,12 +448,12 @@ class PDFProcessor:
                     if len(address) > 10:  # Lowered from 15 to 10
                         # Additional validation: must have at least 2 lines
                         if '\n' in address or len(address) > 30:
-                            print(f"✓ Valid address found: '{address}'")
+                            logger.debug("✓ Valid address found: '%s'", address)
                             return address
                         else:
-                            print(f"✗ Address too short or single line: '{address}'")
+                            logger.debug("✗ Address too short or single line: '%s'", address)
                     else:
-                        print(f"✗ Address too short: '{address}' (length: {len(address)})")
+                        logger.debug("✗ Address too short: '%s' (length: %s)", address, len(address))
             
             # Fallback: Try to extract any text that looks like an address
             lines = text.split('\n')
@@ -293,35 +471,41 @@ class PDFProcessor:
                 if any(skip in line.upper() for skip in skip_terms):
                     continue
                 # Look for lines that might be address components
-                if re.search(r'[A-Za-z]', line) and len(line) > 3:
+                if _LETTER_RE.search(line) and len(line) > 3:
                     address_lines.append(line)
             
             if len(address_lines) >= 2:
                 fallback_address = '\n'.join(address_lines[:4])  # Take first 4 lines
-                print(f"Fallback address extraction: '{fallback_address}'")
+                logger.debug("Fallback address extraction: '%s'", fallback_address)
                 return fallback_address
             
-            print("No address pattern matched")
+            logger.debug("No address pattern matched")
             return ""
             
         except Exception as e:
-            print(f"Error extracting shipping address: {str(e)}")
+            logger.error("Error extracting shipping address: %s", e)
             return ""
     
-    def process_shipping_label_page(self, image_path: str) -> Dict:
+    def process_shipping_label_page(self, image) -> Dict:
         """
-        Process a single shipping label page and extract shipping address using OCR
+        Process a single shipping label page (array or file path) and extract shipping address using OCR
         """
         # Extract text from image using OCR
-        text = self.extract_text_from_image(image_path)
+        text = self.extract_text_from_image(image)
+        return self._build_page_data(text)
+    
+    def _build_page_data(self, text: str) -> Dict:
+        """Extract the shipping address from a page's OCR text"""
+        # Detect the carrier once; address extraction and matching reuse it
+        label_type = self.detect_label_type(text)
         
         # Extract shipping address from OCR text
-        shipping_address = self.extract_shipping_address(text)
+        shipping_address = self.extract_shipping_address(text, label_type)
         
         return {
             'text': text,
+            'label_type': label_type,
             'shipping_address': shipping_address,
-            'image_path': image_path
         }
     
     def calculate_address_similarity(self, address1: str, address2: str) -> float:
@@ -331,19 +515,19 @@ class PDFProcessor:
         if not address1 or not address2:
             return 0.0
         
-        print(f"    Comparing:")
-        print(f"    Address 1: '{address1}'")
-        print(f"    Address 2: '{address2}'")
+        logger.debug("    Comparing:")
+        logger.debug("    Address 1: '%s'", address1)
+        logger.debug("    Address 2: '%s'", address2)
         
         # Normalize addresses for comparison
-        addr1_normalized = re.sub(r'[^\w\s]', ' ', address1.lower())
-        addr2_normalized = re.sub(r'[^\w\s]', ' ', address2.lower())
+        addr1_normalized = _PUNCT_RE.sub(' ', address1.lower())
+        addr2_normalized = _PUNCT_RE.sub(' ', address2.lower())
         
-        addr1_normalized = re.sub(r'\s+', ' ', addr1_normalized).strip()
-        addr2_normalized = re.sub(r'\s+', ' ', addr2_normalized).strip()
+        addr1_normalized = _WS_RE.sub(' ', addr1_normalized).strip()
+        addr2_normalized = _WS_RE.sub(' ', addr2_normalized).strip()
         
         # Overall similarity
-        overall_similarity = SequenceMatcher(None, addr1_normalized, addr2_normalized).ratio()
+        overall_similarity = _similarity_ratio(addr1_normalized, addr2_normalized)
         
         # Extract key components for weighted comparison
         def extract_name(addr):
@@ -355,17 +539,17 @@ class PDFProcessor:
         
         def extract_street_number(addr):
             # Extract street numbers
-            numbers = re.findall(r'\b\d+\b', addr)
+            numbers = _NUMS_RE.findall(addr)
             return ' '.join(numbers)
         
         def extract_zip_code(addr):
             # Extract ZIP codes
-            zip_match = re.search(r'\b\d{5}(?:-\d{4})?\b', addr)
+            zip_match = _ZIP_RE.search(addr)
             return zip_match.group() if zip_match else ''
         
         # Component similarities
         name1, name2 = extract_name(address1), extract_name(address2)
-        name_similarity = SequenceMatcher(None, name1, name2).ratio() if name1 and name2 else 0.0
+        name_similarity = _similarity_ratio(name1, name2) if name1 and name2 else 0.0
         
         street1, street2 = extract_street_number(address1), extract_street_number(address2)
         street_similarity = 1.0 if street1 and street2 and street1 == street2 else 0.0
@@ -381,37 +565,36 @@ class PDFProcessor:
             zip_similarity * 0.05        # 5% weight on ZIP code
         )
         
-        print(f"    Name similarity: {name_similarity:.3f} ('{name1}' vs '{name2}')")
-        print(f"    Street similarity: {street_similarity:.3f} ('{street1}' vs '{street2}')")
-        print(f"    ZIP similarity: {zip_similarity:.3f} ('{zip1}' vs '{zip2}')")
-        print(f"    Overall similarity: {overall_similarity:.3f}")
-        print(f"    Final weighted score: {final_score:.3f}")
+        logger.debug("    Name similarity: %.3f ('%s' vs '%s')", name_similarity, name1, name2)
+        logger.debug("    Street similarity: %.3f ('%s' vs '%s')", street_similarity, street1, street2)
+        logger.debug("    ZIP similarity: %.3f ('%s' vs '%s')", zip_similarity, zip1, zip2)
+        logger.debug("    Overall similarity: %.3f", overall_similarity)
+        logger.debug("    Final weighted score: %.3f", final_score)
         
         return final_score
     
-    def check_address_in_ocr(self, packing_address: str, ocr_normalized: str) -> float:
+    def check_address_in_ocr(self, packing_address: str, ocr_normalized: str,
+                             components: Optional[List[Tuple[str, str, Tuple[str, ...]]]] = None,
+                             ocr_words: Optional[FrozenSet[str]] = None) -> float:
         """
         Check if packing slip address components appear in OCR text
+        components / ocr_words can be passed in precomputed (see prepare_packing_slips)
         """
         if not packing_address:
             return 0.0
             
-        # Normalize the packing slip address
-        address_normalized = re.sub(r'[^\w\s]', ' ', packing_address.lower())
-        address_normalized = re.sub(r'\s+', ' ', address_normalized).strip()
-        
         # Split address into lines and extract key components
-        address_lines = [line.strip() for line in packing_address.split('\n') if line.strip()]
+        if components is None:
+            components = _address_components(packing_address)
+        if ocr_words is None:
+            ocr_words = frozenset(ocr_normalized.split())
         
         total_score = 0.0
         components_found = 0
         
-        print(f"    Checking address components:")
+        logger.debug("    Checking address components:")
         
-        for i, line in enumerate(address_lines):
-            line_normalized = re.sub(r'[^\w\s]', ' ', line.lower())
-            line_normalized = re.sub(r'\s+', ' ', line_normalized).strip()
-            
+        for i, (line, line_normalized, words) in enumerate(components):
             if len(line_normalized) < 3:
                 continue
                 
@@ -423,67 +606,106 @@ class PDFProcessor:
                 else:
                     score_weight = 0.4
                 total_score += score_weight
-                print(f"      ✅ Found: '{line}' (weight: {score_weight})")
+                logger.debug("      ✅ Found: '%s' (weight: %s)", line, score_weight)
             else:
                 # Check for partial matches (individual words)
-                words = [w for w in line_normalized.split() if len(w) > 2]
-                words_found = sum(1 for word in words if word in ocr_normalized)
+                # (whole-word set lookup first; the substring scan only runs for words
+                # OCR glued onto a neighbour)
+                words_found = sum(1 for word in words if word in ocr_words or word in ocr_normalized)
                 if words_found > 0:
                     partial_score = (words_found / len(words)) * 0.3  # Partial match gets lower score
                     total_score += partial_score
                     components_found += 1
-                    print(f"      🔸 Partial: '{line}' ({words_found}/{len(words)} words, score: {partial_score:.2f})")
+                    logger.debug("      🔸 Partial: '%s' (%s/%s words, score: %.2f)", line, words_found, len(words), partial_score)
                 else:
-                    print(f"      ❌ Missing: '{line}'")
+                    logger.debug("      ❌ Missing: '%s'", line)
         
         # Calculate final score
         if components_found > 0:
-            final_score = total_score / len(address_lines)  # Average score per component
+            final_score = total_score / len(components)  # Average score per component
         else:
             final_score = 0.0
             
         return final_score
     
-    def find_best_matching_packing_slip(self, ocr_text: str, packing_slips: List[Dict]) -> Tuple[Optional[int], float]:
+    def prepare_packing_slips(self, packing_slips: List[Dict]) -> Dict[int, List[Tuple[str, str, Tuple[str, ...]]]]:
+        """
+        Normalize every packing slip address once per PDF, so matching each page
+        doesn't redo it for every slip
+        """
+        return {
+            packing_slip['id']: _address_components(packing_slip['ship_to'])
+            for packing_slip in packing_slips
+            if packing_slip.get('ship_to')
+        }
+    
+    def find_best_matching_packing_slip(self, ocr_text: str, packing_slips: List[Dict],
+                                        label_type: Optional[str] = None,
+                                        slip_components: Optional[Dict[int, List[Tuple[str, str, Tuple[str, ...]]]]] = None
+                                        ) -> Tuple[Optional[int], float]:
         """
         Simple approach: Check if any packing slip address appears in the OCR text.
         Works with USPS, FedEx, and UPS labels.
+        Pass slip_components from prepare_packing_slips when matching many pages.
         """
         if not packing_slips:
-            print("No packing slips available for matching")
+            logger.debug("No packing slips available for matching")
             return None, 0.0
         
         if not ocr_text or len(ocr_text.strip()) < 10:
-            print(f"OCR text too short or empty: '{ocr_text[:50]}...'")
+            logger.debug("OCR text too short or empty: '%s...'", ocr_text[:50])
             return None, 0.0
         
         # Detect label type for better matching
-        label_type = self.detect_label_type(ocr_text)
+        if label_type is None:
+            label_type = self.detect_label_type(ocr_text)
         
-        print(f"=== ADDRESS MATCHING ({label_type} Label) ===")
-        print(f"OCR text length: {len(ocr_text)} characters")
-        print(f"Checking if any of {len(packing_slips)} packing slip addresses appear in OCR text...")
+        logger.debug("=== ADDRESS MATCHING (%s Label) ===", label_type)
+        logger.debug("OCR text length: %s characters", len(ocr_text))
+        logger.debug("Checking if any of %s packing slip addresses appear in OCR text...", len(packing_slips))
         
         # Normalize OCR text for better matching
-        ocr_normalized = re.sub(r'[^\w\s]', ' ', ocr_text.lower())
-        ocr_normalized = re.sub(r'\s+', ' ', ocr_normalized).strip()
+        ocr_normalized = _normalize_text(ocr_text)
+        ocr_words = frozenset(ocr_normalized.split())
+        if slip_components is None:
+            slip_components = self.prepare_packing_slips(packing_slips)
+        
+        # Best score any slip from position i onwards could still reach, so the
+        # scan can stop once nothing left can beat the current best
+        remaining_ceiling = [0.0] * (len(packing_slips) + 1)
+        for i in range(len(packing_slips) - 1, -1, -1):
+            packing_slip = packing_slips[i]
+            ceiling = 0.0
+            if packing_slip.get('ship_to'):
+                components = slip_components.get(packing_slip['id'])
+                if components is None:
+                    components = _address_components(packing_slip['ship_to'])
+                ceiling = _max_address_score(components)
+            remaining_ceiling[i] = max(ceiling, remaining_ceiling[i + 1])
         
         best_match_id = None
         best_score = 0.0
         
-        for packing_slip in packing_slips:
+        for i, packing_slip in enumerate(packing_slips):
+            if best_score > 0.0 and best_score >= remaining_ceiling[i]:
+                logger.debug("No remaining packing slip can beat score %.3f; skipping %s",
+                             best_score, len(packing_slips) - i)
+                break
+            
             if not packing_slip.get('ship_to'):
-                print(f"Skipping packing slip {packing_slip['id']} (Order: {packing_slip.get('order_id', 'N/A')}) - no shipping address")
+                logger.debug("Skipping packing slip %s (Order: %s) - no shipping address", packing_slip['id'], packing_slip.get('order_id', 'N/A'))
                 continue
             
             packing_address = packing_slip['ship_to']
-            print(f"\nChecking packing slip {packing_slip['id']} (Order: {packing_slip.get('order_id', 'N/A')}):")
-            print(f"  Address: '{packing_address}'")
+            logger.debug("Checking packing slip %s (Order: %s):", packing_slip['id'], packing_slip.get('order_id', 'N/A'))
+            logger.debug("  Address: '%s'", packing_address)
             
             # Check if key parts of packing slip address appear in OCR text
-            score = self.check_address_in_ocr(packing_address, ocr_normalized)
+            score = self.check_address_in_ocr(
+                packing_address, ocr_normalized, slip_components.get(packing_slip['id']), ocr_words
+            )
             
-            print(f"  Match score: {score:.3f}")
+            logger.debug("  Match score: %.3f", score)
             
             if score > best_score:
                 best_score = score
@@ -493,21 +715,59 @@ class PDFProcessor:
         # Different carriers have different OCR quality and layouts
         if label_type == 'FEDEX':
             minimum_threshold = 0.25  # Lower threshold for FedEx
-            print(f"Using FedEx threshold: {minimum_threshold}")
+            logger.debug("Using FedEx threshold: %s", minimum_threshold)
         elif label_type == 'UPS':
             minimum_threshold = 0.28  # Slightly lower threshold for UPS
-            print(f"Using UPS threshold: {minimum_threshold}")
+            logger.debug("Using UPS threshold: %s", minimum_threshold)
         else:
             minimum_threshold = 0.3   # Standard threshold for USPS
-            print(f"Using USPS threshold: {minimum_threshold}")
+            logger.debug("Using USPS threshold: %s", minimum_threshold)
         
         if best_score >= minimum_threshold:
-            print(f"\n✅ MATCHED: Packing slip {best_match_id} with score {best_score:.3f}")
+            logger.debug("✅ MATCHED: Packing slip %s with score %.3f", best_match_id, best_score)
             return best_match_id, best_score
         else:
-            print(f"\n❌ NO MATCH: Best score {best_score:.3f} below threshold {minimum_threshold}")
+            logger.debug("❌ NO MATCH: Best score %.3f below threshold %s", best_score, minimum_threshold)
             return None, 0.0
     
+    def _match_page(self, page_num: int, text: str, source: str, packing_slips: List[Dict],
+                    slip_components: Dict[int, List[Tuple[str, str, Tuple[str, ...]]]],
+                    google_drive_file_link: str) -> Dict:
+        """Extract the address from one page's text and match it to a packing slip"""
+        logger.debug("📄 Processing page %s...", page_num)
+        
+        page_data = self._build_page_data(text)
+        label_type = page_data['label_type']
+        
+        logger.debug("✓ %s text extracted from page %s", 'Embedded' if source == 'text' else 'OCR', page_num)
+        logger.debug("✓ Label Type: %s", label_type)
+        logger.debug("✓ Extracted shipping address: %s", page_data['shipping_address'])
+        
+        # Find matching packing slip using full OCR text (already filtered by folder)
+        logger.debug("🔍 Matching against %s packing slips from same folder...", len(packing_slips))
+        packing_slip_id, confidence_score = self.find_best_matching_packing_slip(
+            page_data['text'],  # Use full OCR text instead of just extracted address
+            packing_slips,
+            label_type,
+            slip_components
+        )
+        
+        if packing_slip_id is not None:
+            logger.debug("✅ Page %s (%s) - MATCHED to packing slip %s", page_num, label_type, packing_slip_id)
+        else:
+            logger.debug("❌ Page %s (%s) - NO MATCH FOUND", page_num, label_type)
+        
+        return {
+            'page_number': page_num,
+            'google_drive_file_link': google_drive_file_link,  # Store Google Drive link instead of local file
+            'shipping_address': page_data['shipping_address'],
+            'packing_slip_id': packing_slip_id,
+            'confidence_score': confidence_score,
+            'matched': packing_slip_id is not None,
+            'label_type': label_type,  # Store label type for debugging
+            'source': source  # 'text' (embedded text layer) or 'ocr'
+        }
+    
     def process_shipping_labels_pdf(self, pdf_path: str, packing_slips: List[Dict], google_drive_file_link: str) -> List[Dict]:
         """
         Process a PDF containing shipping labels and match them to packing slips.
@@ -517,64 +777,65 @@ class PDFProcessor:
         results = []
         
         try:
-            print(f"\n{'='*80}")
-            print(f"📦 PROCESSING SHIPPING LABELS PDF")
-            print(f"{'='*80}")
-            
-            # Extract pages from PDF as images for OCR only (temporary)
-            page_paths = self.extract_pages_from_pdf(pdf_path)
-            print(f"Extracted {len(page_paths)} page(s) from PDF")
-            
-            for page_num, page_path in enumerate(page_paths, 1):
-                print(f"\n{'─'*80}")
-                print(f"📄 Processing page {page_num}/{len(page_paths)}...")
-                print(f"{'─'*80}")
-                
-                # Process each page using OCR on the image
-                page_data = self.process_shipping_label_page(page_path)
+            logger.debug("📦 PROCESSING SHIPPING LABELS PDF")
+            
+            # Extract pages from PDF: text layer where usable, otherwise images for OCR only (temporary)
+            pages = self.extract_pages_from_pdf(pdf_path)
+            slip_components = self.prepare_packing_slips(packing_slips)
+            
+            # Pipeline: pages needing OCR are sent to the worker pool in small batches
+            # (one tesseract run each) as they come in, while this thread matches the
+            # pages that are already done. `pending` holds work in page order:
+            # (page numbers, OCR future or list of embedded texts, source).
+            batch_pages = 1 if tesserocr is not None else OCR_BATCH_PAGES
+            max_in_flight = 2 * OCR_WORKERS
+            pending = deque()
+            in_flight = 0
+            batch = []
+            
+            def finish_oldest():
+                nonlocal in_flight
+                page_nums, work, source = pending.popleft()
+                if source == 'ocr':
+                    in_flight -= 1
+                    work = work.result()
+                for page_num, text in zip(page_nums, work):
+                    results.append(self._match_page(
+                        page_num, text, source, packing_slips, slip_components, google_drive_file_link
+                    ))
+            
+            with ThreadPoolExecutor(max_workers=OCR_WORKERS) as pool:
+                def submit_batch():
+                    nonlocal batch, in_flight
+                    if batch:
+                        pending.append(([page_num for page_num, _ in batch], pool.submit(self._batch_ocr, batch), 'ocr'))
+                        in_flight += 1
+                        batch = []
                 
-                # Detect label type
-                label_type = self.detect_label_type(page_data['text'])
-                
-                print(f"✓ OCR text extracted from page {page_num}")
-                print(f"✓ Label Type: {label_type}")
-                print(f"✓ Extracted shipping address: {page_data['shipping_address']}")
-                
-                # Find matching packing slip using full OCR text (already filtered by folder)
-                print(f"\n🔍 Matching against {len(packing_slips)} packing slips from same folder...")
-                packing_slip_id, confidence_score = self.find_best_matching_packing_slip(
-                    page_data['text'],  # Use full OCR text instead of just extracted address
-                    packing_slips
-                )
-                
-                result = {
-                    'page_number': page_num,
-                    'google_drive_file_link': google_drive_file_link,  # Store Google Drive link instead of local file
-                    'shipping_address': page_data['shipping_address'],
-                    'packing_slip_id': packing_slip_id,
-                    'confidence_score': confidence_score,
-                    'matched': packing_slip_id is not None,
-                    'label_type': label_type  # Store label type for debugging
-                }
-                
-                results.append(result)
+                for page_num, (text, image) in enumerate(pages, 1):
+                    if text is not None:
+                        submit_batch()  # keep page order
+                        pending.append(([page_num], [text], 'text'))
+                    else:
+                        batch.append((page_num, image))
+                        if len(batch) >= batch_pages:
+                            submit_batch()
+                    # Match finished pages as we go; bound the OCR backlog
+                    while pending and (in_flight > max_in_flight or pending[0][2] == 'text' or pending[0][1].done()):
+                        finish_oldest()
                 
-                if result['matched']:
-                    print(f"✅ Page {page_num} ({label_type}) - MATCHED to packing slip {packing_slip_id}")
-                else:
-                    print(f"❌ Page {page_num} ({label_type}) - NO MATCH FOUND")
+                submit_batch()
+                while pending:
+                    finish_oldest()
             
-            print(f"\n{'='*80}")
-            print(f"📊 PROCESSING COMPLETE")
-            print(f"Total pages: {len(results)}")
-            print(f"Matched: {sum(1 for r in results if r['matched'])}")
-            print(f"Unmatched: {sum(1 for r in results if not r['matched'])}")
-            print(f"{'='*80}\n")
+            matched = sum(1 for r in results if r['matched'])
+            logger.info(
+                "Processed shipping labels PDF: %s page(s), %s matched, %s unmatched",
+                len(results), matched, len(results) - matched
+            )
         
         except Exception as e:
-            print(f"Error processing shipping labels PDF: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error processing shipping labels PDF: %s", e)
         
         finally:
             # Clean up temporary files (no permanent files created)
@@ -589,4 +850,4 @@ class PDFProcessor:
             if os.path.exists(self.temp_dir):
                 shutil.rmtree(self.temp_dir)
         except Exception as e:
-            print(f"Error cleaning up temp files: {str(e)}")
+            logger.warning("Error cleaning up temp files: %s", e)
@@ -0,0 +1,104 @@
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def requested_fields(request):
+    """
+    Field names a GET request asked for with ?fields=a,b,c, or None for all of
+    them. Writes always use every field, so a stray ?fields= can't drop input
+    """
+    if request is None or request.method != 'GET':
+        return None
+    fields = request.query_params.get('fields')
+    if not fields:
+        return None
+    return frozenset(name.strip() for name in fields.split(',') if name.strip())
+
+
+# SerializerMethodFields hide which relations they read, so name them here
+METHOD_FIELD_PREFETCHES = {
+    'shipping_labels': 'files',
+    'dst_files': 'files',
+    'dgt_files': 'files',
+}
+
+
+@lru_cache(maxsize=None)
+def serializer_relations(serializer_class, fields=None):
+    """
+    (select_related paths, prefetch_related paths) a serializer's fields will
+    traverse, worked out from their dotted ``source`` against the model's _meta.
+    Pass a frozenset of field names to only consider those
+    """
+    model = serializer_class.Meta.model
+    select, prefetch = set(), set()
+
+    for name, field in serializer_class().fields.items():
+        if fields is not None and name not in fields:
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            if name in METHOD_FIELD_PREFETCHES:
+                prefetch.add(METHOD_FIELD_PREFETCHES[name])
+            continue
+
+        # Only the parts before the last one are relations that have to be followed
+        current, path, many = model, [], False
+        for part in field.source.split('.')[:-1]:
+            try:
+                model_field = current._meta.get_field(part)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation:
+                break
+            path.append(part)
+            if model_field.many_to_many or model_field.one_to_many:
+                many = True
+                break
+            current = model_field.related_model
+        if path:
+            (prefetch if many else select).add('__'.join(path))
+
+    return tuple(sorted(select)), tuple(sorted(prefetch))
+
+
+def auto_prefetch(queryset, serializer_class, fields=None):
+    """Add the joins/prefetches serializer_class needs, leaving ones already on the queryset alone"""
+    select, prefetch = serializer_relations(serializer_class, fields)
+    if select:
+        queryset = queryset.select_related(*select)
+
+    existing = {
+        lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+        for lookup in queryset._prefetch_related_lookups
+    }
+    missing = [lookup for lookup in prefetch if lookup not in existing]
+    if missing:
+        queryset = queryset.prefetch_related(*missing)
+    return queryset
+
+
+class AutoPrefetchViewSetMixin:
+    """
+    Applies auto_prefetch for the viewset's serializer. Hooked on filter_queryset
+    so it runs on whatever a viewset's own get_queryset() built, for list and
+    get_object() alike
+    """
+
+    def filter_queryset(self, queryset):
+        return auto_prefetch(
+            super().filter_queryset(queryset), self.get_serializer_class(), requested_fields(self.request)
+        )
+
+
+class FieldsListSerializerMixin:
+    """Drops the fields a GET request didn't list in ?fields= (see requested_fields)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get('request'))
+        if fields is not None:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
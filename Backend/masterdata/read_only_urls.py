@@ -0,0 +1,14 @@
+from django.urls import path
+from .views import (
+    OrdersByStatusView,
+    ProductAnalyticsView
+)
+
+# GET-only dashboard drill-downs, included through cached_include at the root
+urlpatterns = [
+    # Orders
+    path('orders/by-status/', OrdersByStatusView.as_view(), name='orders-by-status'),
+    
+    # Product Analytics
+    path('product/analytics/', ProductAnalyticsView.as_view(), name='product-analytics'),
+]
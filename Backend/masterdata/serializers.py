@@ -1,5 +1,21 @@
+from django.db.models import Value
+from django.db.models.functions import Lower
+from django.db.models.lookups import Exact
 from rest_framework import serializers
 from .models import Product, Account, PackingSlip, File, Expense
+from .prefetch import FieldsListSerializerMixin
+
+
+def _taken_ignoring_case(serializer, field_name, value):
+    """
+    Whether another row already has value in field_name, ignoring case. Compares
+    LOWER(field) = LOWER(value) so the lookup is served by the model's Lower()
+    unique index (iexact compiles to LIKE / UPPER() and can't use it)
+    """
+    queryset = serializer.Meta.model.objects.filter(Exact(Lower(field_name), Lower(Value(value))))
+    if serializer.instance is not None:
+        queryset = queryset.exclude(pk=serializer.instance.pk)
+    return queryset.exists()
 
 
 class ProductSerializer(serializers.ModelSerializer):
@@ -8,14 +24,8 @@ class ProductSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def validate_code(self, value):
-        # Check if code exists for other records (excluding current instance during updates)
-        instance = getattr(self, 'instance', None)
-        if instance:
-            if Product.objects.filter(code=value).exclude(id=instance.id).exists():
-                raise serializers.ValidationError("Product with this code already exists.")
-        else:
-            if Product.objects.filter(code=value).exists():
-                raise serializers.ValidationError("Product with this code already exists.")
+        if _taken_ignoring_case(self, 'code', value):
+            raise serializers.ValidationError("Product with this code already exists.")
         return value
 
     def validate_sku_buy_cost(self, value):
@@ -35,14 +45,8 @@ class AccountSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def validate_account_name(self, value):
-        # Check if account_name exists for other records (excluding current instance during updates)
-        instance = getattr(self, 'instance', None)
-        if instance:
-            if Account.objects.filter(account_name=value).exclude(id=instance.id).exists():
-                raise serializers.ValidationError("Account with this name already exists.")
-        else:
-            if Account.objects.filter(account_name=value).exists():
-                raise serializers.ValidationError("Account with this name already exists.")
+        if _taken_ignoring_case(self, 'account_name', value):
+            raise serializers.ValidationError("Account with this name already exists.")
         return value
 
 
@@ -52,7 +56,7 @@ class FileSerializer(serializers.ModelSerializer):
         fields = ['id', 'packing_slip', 'file_type', 'file_path', 'page_number', 'created_at']
 
 
-class PackingSlipSerializer(serializers.ModelSerializer):
+class PackingSlipSerializer(FieldsListSerializerMixin, serializers.ModelSerializer):
     product_code = serializers.CharField(source='product.code', read_only=True)
     product_name = serializers.CharField(source='product.name', read_only=True)
     shipping_labels = serializers.SerializerMethodField()
@@ -71,22 +75,34 @@ class PackingSlipSerializer(serializers.ModelSerializer):
                  'tracking_vendor', 'tracking_status',
                  'created_at', 'updated_at']
         extra_kwargs = {
-            'product': {'required': False}  # Make product optional for updates since it shouldn't change
+            'product': {'required': False},  # Make product optional for updates since it shouldn't change
+            'tracking_vendor': {'allow_blank': True},  # Stored as an integer, so DRF doesn't infer this
         }
 
+    def _files_of_type(self, obj, file_type):
+        # Bucket in Python so a with_files() prefetch is reused instead of querying per slip;
+        # the buckets are kept on the instance so the three file fields share one pass
+        files_by_type = obj.__dict__.get('_files_by_type')
+        if files_by_type is None:
+            files_by_type = {}
+            for f in obj.files.all():
+                files_by_type.setdefault(f.file_type, []).append(f)
+            obj.__dict__['_files_by_type'] = files_by_type
+        return files_by_type.get(file_type, [])
+
     def get_shipping_labels(self, obj):
         """Get only shipping label files for this packing slip"""
-        shipping_files = obj.files.filter(file_type='shipping_label')
+        shipping_files = self._files_of_type(obj, 'shipping_label')
         return FileSerializer(shipping_files, many=True).data
     
     def get_dst_files(self, obj):
         """Get only DST files for this packing slip"""
-        dst_files = obj.files.filter(file_type='dst')
+        dst_files = self._files_of_type(obj, 'dst')
         return FileSerializer(dst_files, many=True).data
     
     def get_dgt_files(self, obj):
         """Get only DGT files for this packing slip"""
-        dgt_files = obj.files.filter(file_type='dgt')
+        dgt_files = self._files_of_type(obj, 'dgt')
         return FileSerializer(dgt_files, many=True).data
 
     def validate_quantity(self, value):
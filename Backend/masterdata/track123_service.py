@@ -1,15 +1,59 @@
 """
 Track123 API service for package tracking
 """
+import re
 import requests
 import logging
 from typing import List, Dict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # Faster JSON decoding for the (large, batched) query responses
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 TRACK123_API_URL = "https://api.track123.com/gateway/open-api/tk/v2/track/import"
 TRACK123_QUERY_URL = "https://api.track123.com/gateway/open-api/tk/v2/track/query"
 
+# Convert status codes to readable format
+STATUS_MAPPING = {
+    'DELIVERED': 'Delivered',
+    'IN_TRANSIT': 'In Transit',
+    'INFO_RECEIVED': 'Info Received',
+    'WAITING_DELIVERY': 'Out for Delivery',
+    'DELIVERY_FAILED': 'Delivery Failed',
+    'EXCEPTION': 'Exception'
+}
+# Status codes may carry a suffix; an anchored alternation tries the prefixes
+# in the same order the old startswith() loop did
+_STATUS_PREFIX_RE = re.compile('|'.join(re.escape(code) for code in STATUS_MAPPING))
+
+# One pooled session per process: keep-alive reuses the TLS connection across
+# calls. Queries are reads, so gateway errors and failed connects are retried
+# with a short backoff; read timeouts aren't, so a slow API can't hold a
+# request for several 30s timeouts
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    'accept': 'application/json',
+    'content-type': 'application/json'
+})
+_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, read=0, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                      allowed_methods=frozenset({'GET', 'POST'}), raise_on_status=False),
+))
+# Imports create trackings and aren't idempotent, so they are never retried
+# (the longer mount prefix wins over the one above)
+_SESSION.mount(TRACK123_API_URL, HTTPAdapter(pool_connections=1, pool_maxsize=8, max_retries=0))
+
+# Tracking numbers sent per query request
+QUERY_BATCH_SIZE = 40
+
 
 def import_tracking_to_track123(api_key: str, tracking_numbers: List[str], courier_code: str) -> Dict:
     """
@@ -46,16 +90,12 @@ def import_tracking_to_track123(api_key: str, tracking_numbers: List[str], couri
         return {'success': False, 'error': 'No valid tracking numbers provided'}
     
     try:
-        headers = {
-            'Track123-Api-Secret': api_key,
-            'accept': 'application/json',
-            'content-type': 'application/json'
-        }
+        headers = {'Track123-Api-Secret': api_key}
         
-        response = requests.post(TRACK123_API_URL, headers=headers, json=payload, timeout=30)
+        response = _SESSION.post(TRACK123_API_URL, headers=headers, json=payload, timeout=30)
         
         if response.status_code == 200:
-            response_data = response.json()
+            response_data = _json(response)
             logger.info(f"Successfully imported {len(payload)} tracking numbers to Track123")
             return {
                 'success': True,
@@ -65,7 +105,7 @@ def import_tracking_to_track123(api_key: str, tracking_numbers: List[str], couri
         else:
             error_msg = f"Track123 API returned status {response.status_code}"
             try:
-                error_data = response.json()
+                error_data = _json(response)
                 error_msg = error_data.get('message', error_data.get('error', error_msg))
             except ValueError:
                 error_msg = f"{error_msg}: {response.text}"
@@ -88,6 +128,38 @@ def import_tracking_to_track123(api_key: str, tracking_numbers: List[str], couri
         return {'success': False, 'error': f'Unexpected error: {str(e)}'}
 
 
+def _json(response) -> Dict:
+    """Decode a response body: orjson when installed, else requests' stdlib decoder (both raise ValueError)"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _extract_status(item: Dict) -> str:
+    """Readable status for one entry of a query response's data.accepted.content"""
+    status = None
+    transit_status = item.get('transitStatus')
+    
+    if transit_status:
+        # Map status code to readable format; if no mapping found, use the original status
+        match = _STATUS_PREFIX_RE.match(transit_status)
+        status = STATUS_MAPPING[match.group()] if match else transit_status
+        
+        # Add event detail from latest tracking event if available
+        logistics_info = item.get('localLogisticsInfo', {})
+        tracking_details = logistics_info.get('trackingDetails', [])
+        if tracking_details and len(tracking_details) > 0:
+            latest_event = tracking_details[0]
+            event_detail = latest_event.get('eventDetail', '')
+            if event_detail:
+                status = f"{status} - {event_detail}"
+    
+    # Fallback to transitSubStatus if transitStatus not available
+    if not status:
+        status = item.get('transitSubStatus', 'Status not available')
+    return status
+
+
 def get_tracking_status(api_key: str, tracking_number: str, courier_code: str) -> Dict:
     """
     Get tracking status from Track123 API
@@ -110,18 +182,14 @@ def get_tracking_status(api_key: str, tracking_number: str, courier_code: str) -
         return {'success': False, 'error': 'Courier code is required'}
     
     try:
-        headers = {
-            'Track123-Api-Secret': api_key,
-            'accept': 'application/json',
-            'content-type': 'application/json'
-        }
+        headers = {'Track123-Api-Secret': api_key}
         
         payload = {"trackNos": [tracking_number.strip()]}
         
-        response = requests.post(TRACK123_QUERY_URL, headers=headers, json=payload, timeout=30)
+        response = _SESSION.post(TRACK123_QUERY_URL, headers=headers, json=payload, timeout=30)
         
         if response.status_code == 200:
-            response_data = response.json()
+            response_data = _json(response)
             logger.info(f"Successfully fetched tracking status for {tracking_number}")
             
             # Extract status from Track123 response structure: data.accepted.content[0]
@@ -129,42 +197,7 @@ def get_tracking_status(api_key: str, tracking_number: str, courier_code: str) -
             try:
                 content = response_data.get('data', {}).get('accepted', {}).get('content', [])
                 if content and len(content) > 0:
-                    first_item = content[0]
-                    transit_status = first_item.get('transitStatus')
-                    
-                    if transit_status:
-                        # Convert status codes to readable format
-                        status_mapping = {
-                            'DELIVERED': 'Delivered',
-                            'IN_TRANSIT': 'In Transit',
-                            'INFO_RECEIVED': 'Info Received',
-                            'WAITING_DELIVERY': 'Out for Delivery',
-                            'DELIVERY_FAILED': 'Delivery Failed',
-                            'EXCEPTION': 'Exception'
-                        }
-                        
-                        # Map status code to readable format
-                        for code, readable in status_mapping.items():
-                            if transit_status.startswith(code):
-                                status = readable
-                                break
-                        
-                        # If no mapping found, use the original status
-                        if not status:
-                            status = transit_status
-                        
-                        # Add event detail from latest tracking event if available
-                        logistics_info = first_item.get('localLogisticsInfo', {})
-                        tracking_details = logistics_info.get('trackingDetails', [])
-                        if tracking_details and len(tracking_details) > 0:
-                            latest_event = tracking_details[0]
-                            event_detail = latest_event.get('eventDetail', '')
-                            if event_detail:
-                                status = f"{status} - {event_detail}"
-                    
-                    # Fallback to transitSubStatus if transitStatus not available
-                    if not status:
-                        status = first_item.get('transitSubStatus', 'Status not available')
+                    status = _extract_status(content[0])
             except (KeyError, IndexError, AttributeError) as e:
                 logger.warning(f"Error extracting status from Track123 response: {str(e)}")
                 status = 'Status not available'
@@ -177,7 +210,7 @@ def get_tracking_status(api_key: str, tracking_number: str, courier_code: str) -
         else:
             error_msg = f"Track123 API returned status {response.status_code}"
             try:
-                error_data = response.json()
+                error_data = _json(response)
                 error_msg = error_data.get('msg', error_data.get('message', error_data.get('error', error_msg)))
             except ValueError:
                 error_msg = f"{error_msg}: {response.text}"
@@ -198,3 +231,79 @@ def get_tracking_status(api_key: str, tracking_number: str, courier_code: str) -
     except Exception as e:
         logger.error(f"Unexpected error calling Track123 API: {str(e)}")
         return {'success': False, 'error': f'Unexpected error: {str(e)}'}
+
+
+def get_tracking_status_batch(api_key: str, tracking_numbers: List[str], courier_code: str) -> Dict:
+    """
+    Get tracking status for several tracking numbers from Track123 API, in
+    requests of up to QUERY_BATCH_SIZE numbers each
+    
+    Args:
+        api_key: Track123 API key
+        tracking_numbers: Tracking numbers to query
+        courier_code: Courier code (e.g., 'fedex', 'ups', 'usps')
+    
+    Returns:
+        Dict with 'success' (bool) and 'statuses' (tracking number -> status str)
+        or 'error' keys. Numbers Track123 didn't return are left out of 'statuses'.
+        On failure, 'statuses' holds the batches fetched before it and
+        'retryable' says whether the error was transient (timeout, 429, 5xx)
+    """
+    if not api_key:
+        return {'success': False, 'error': 'Track123 API key is not configured'}
+    
+    tracking_numbers = [no.strip() for no in tracking_numbers if no and no.strip()]
+    if not tracking_numbers:
+        return {'success': False, 'error': 'No valid tracking numbers provided'}
+    
+    if not courier_code:
+        return {'success': False, 'error': 'Courier code is required'}
+    
+    headers = {'Track123-Api-Secret': api_key}
+    statuses = {}
+    
+    try:
+        for start in range(0, len(tracking_numbers), QUERY_BATCH_SIZE):
+            batch = tracking_numbers[start:start + QUERY_BATCH_SIZE]
+            response = _SESSION.post(TRACK123_QUERY_URL, headers=headers, json={"trackNos": batch}, timeout=30)
+            
+            if response.status_code != 200:
+                error_msg = f"Track123 API returned status {response.status_code}"
+                try:
+                    error_data = _json(response)
+                    error_msg = error_data.get('msg', error_data.get('message', error_data.get('error', error_msg)))
+                except ValueError:
+                    error_msg = f"{error_msg}: {response.text}"
+                
+                logger.error(f"Track123 API error: {error_msg}")
+                return {
+                    'success': False,
+                    'error': error_msg,
+                    'status_code': response.status_code,
+                    'statuses': statuses,
+                    # Rate limiting and server errors are worth another try; other 4xx are not
+                    'retryable': response.status_code == 429 or response.status_code >= 500
+                }
+            
+            content = _json(response).get('data', {}).get('accepted', {}).get('content', [])
+            for item in content:
+                track_no = item.get('trackNo')
+                if track_no:
+                    try:
+                        statuses[track_no] = str(_extract_status(item))
+                    except (KeyError, IndexError, AttributeError) as e:
+                        logger.warning(f"Error extracting status for {track_no} from Track123 response: {str(e)}")
+                        statuses[track_no] = 'Status not available'
+    
+        logger.info(f"Successfully fetched tracking status for {len(statuses)}/{len(tracking_numbers)} tracking numbers")
+        return {'success': True, 'statuses': statuses}
+    
+    except requests.exceptions.Timeout:
+        logger.error("Track123 API request timed out")
+        return {'success': False, 'error': 'Request to Track123 API timed out', 'statuses': statuses, 'retryable': True}
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Track123 API request failed: {str(e)}")
+        return {'success': False, 'error': f'Failed to connect to Track123 API: {str(e)}', 'statuses': statuses, 'retryable': True}
+    except Exception as e:
+        logger.error(f"Unexpected error calling Track123 API: {str(e)}")
+        return {'success': False, 'error': f'Unexpected error: {str(e)}', 'statuses': statuses}
@@ -4,19 +4,67 @@ Fetches tracking status for orders and updates their delivery status.
 Skips orders that are already marked as delivered.
 """
 
+import random
+import threading
+from collections import defaultdict
+from datetime import timedelta
 from typing import Dict, List
-from django.db.models import Q
+from cachetools import TTLCache
+from django.db import IntegrityError
+from django.db.models import Case, F, Value, When
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
 from django_q.tasks import async_task, schedule
 from django_q.models import Schedule
 import logging
 
-from masterdata.models import PackingSlip
-from masterdata.track123_service import get_tracking_status
+from masterdata.models import PackingSlip, TrackingDeadLetter
+from masterdata.track123_service import get_tracking_status, get_tracking_status_batch, QUERY_BATCH_SIZE
 from users.models import GoogleDriveSettings
 
 
 logger = logging.getLogger(__name__)
 
+# A batch that hits a transient Track123 error (timeout, 429, 5xx) is retried
+# with exponential backoff; after the last attempt its orders are dead-lettered
+TRACKING_MAX_ATTEMPTS = 5
+TRACKING_RETRY_MAX_DELAY = 600  # seconds
+
+
+def _retry_delay(attempt: int) -> float:
+    """Seconds to wait before retrying after the given attempt: 2, 4, 8... minutes capped at 10, plus jitter"""
+    delay = min(60 * 2 ** attempt, TRACKING_RETRY_MAX_DELAY)
+    return delay + random.uniform(0, delay / 10)
+
+
+# Every tracking task needs the API key; it only changes when the settings are edited
+TRACK123_API_KEY_CACHE_TTL = 300  # seconds
+_track123_api_key_cache = TTLCache(maxsize=1, ttl=TRACK123_API_KEY_CACHE_TTL)
+_track123_api_key_lock = threading.Lock()
+
+
+def _get_track123_api_key() -> str:
+    """Track123 API key from the active Google Drive settings ('' if none is configured), cached per process"""
+    with _track123_api_key_lock:
+        api_key = _track123_api_key_cache.get('api_key')
+    if api_key is None:
+        api_key = GoogleDriveSettings.objects.filter(
+            is_active=True
+        ).exclude(
+            track123_api_key=''
+        ).values_list('track123_api_key', flat=True).first() or ''
+        with _track123_api_key_lock:
+            _track123_api_key_cache['api_key'] = api_key
+    return api_key
+
+
+@receiver(post_save, sender=GoogleDriveSettings)
+@receiver(post_delete, sender=GoogleDriveSettings)
+def _clear_track123_api_key(sender, instance, **kwargs):
+    with _track123_api_key_lock:
+        _track123_api_key_cache.clear()
+
 
 def update_single_order_tracking(packing_slip_id: int) -> Dict:
     """
@@ -29,7 +77,10 @@ def update_single_order_tracking(packing_slip_id: int) -> Dict:
         Dict with success status and message
     """
     try:
-        packing_slip = PackingSlip.objects.get(id=packing_slip_id)
+        # Only the columns this task reads or writes
+        packing_slip = PackingSlip.objects.only(
+            'id', 'order_id', 'status', 'primary_tracking_id', 'tracking_vendor', 'tracking_status'
+        ).get(id=packing_slip_id)
 
         # Skip if already delivered (check order status)
         if packing_slip.status == 'delivered':
@@ -42,7 +93,7 @@ def update_single_order_tracking(packing_slip_id: int) -> Dict:
             }
 
         # Skip if no tracking information
-        if not packing_slip.tracking_ids or not packing_slip.tracking_vendor:
+        if not packing_slip.primary_tracking_id or not packing_slip.tracking_vendor:
             logger.warning(f"Order {packing_slip.order_id} has no tracking information.")
             return {
                 'success': False,
@@ -50,17 +101,16 @@ def update_single_order_tracking(packing_slip_id: int) -> Dict:
                 'error': 'No tracking information available'
             }
 
-        # Get Track123 API key from user's settings
+        # Get Track123 API key from the active Google Drive settings
         try:
-            drive_settings = GoogleDriveSettings.objects.filter(user=packing_slip.product.owner).first()
-            if not drive_settings or not drive_settings.track123_api_key:
-                logger.error(f"No Track123 API key found for user {packing_slip.product.owner.username}")
+            api_key = _get_track123_api_key()
+            if not api_key:
+                logger.error("No Track123 API key found in active Google Drive settings")
                 return {
                     'success': False,
                     'order_id': packing_slip.order_id,
                     'error': 'No Track123 API key configured'
                 }
-            api_key = drive_settings.track123_api_key
         except Exception as e:
             logger.error(f"Error getting API key: {str(e)}")
             return {
@@ -69,20 +119,9 @@ def update_single_order_tracking(packing_slip_id: int) -> Dict:
                 'error': f'Error getting API key: {str(e)}'
             }
 
-        # Parse tracking IDs (handle comma-separated string)
-        tracking_ids = packing_slip.tracking_ids.split(',') if isinstance(packing_slip.tracking_ids, str) else [packing_slip.tracking_ids]
-        tracking_ids = [tid.strip() for tid in tracking_ids if tid.strip()]
-
-        if not tracking_ids:
-            return {
-                'success': False,
-                'order_id': packing_slip.order_id,
-                'error': 'No valid tracking IDs'
-            }
-
         # Get tracking status for the first tracking ID
         # (You can modify this to handle multiple tracking IDs if needed)
-        tracking_number = tracking_ids[0]
+        tracking_number = packing_slip.primary_tracking_id
 
         # Map vendor to courier code
         courier_code = packing_slip.tracking_vendor.lower()
@@ -139,61 +178,255 @@ def update_single_order_tracking(packing_slip_id: int) -> Dict:
         }
 
 
-def update_all_pending_orders() -> Dict:
+def update_orders_tracking_batch(packing_slip_ids: List[int], courier_code: str, attempt: int = 1) -> Dict:
     """
-    Update tracking status for all orders that are shipped but not delivered.
-    This is the main function that should be scheduled with Django Q2.
+    Update tracking status for several packing slips shipped with the same
+    courier, querying Track123 for all of them at once. Orders left without a
+    status by a transient failure are retried later (see _handle_batch_failure).
+
+    Args:
+        packing_slip_ids: IDs of the PackingSlips to update
+        courier_code: Courier code shared by these packing slips
+        attempt: Which attempt this is, counting from 1
 
     Returns:
-        Dict with summary of updates
+        Dict with success status and counts of updated / delivered orders
     """
     try:
-        # Query for shipped orders that are not delivered
-        # Exclude orders with no tracking info or already delivered
-        pending_orders = PackingSlip.objects.filter(
-            status='shipped'
+        packing_slips = PackingSlip.objects.filter(
+            id__in=packing_slip_ids
         ).exclude(
-            Q(tracking_ids__isnull=True) |
-            Q(tracking_ids__exact='') |
-            Q(tracking_vendor__isnull=True) |
-            Q(tracking_vendor__exact='') |
-            Q(status__iexact='delivered')
-        )
+            status='delivered'
+        ).exclude(
+            primary_tracking_id=''
+        ).values_list('id', 'primary_tracking_id')
 
-        total_orders = pending_orders.count()
-        logger.info(f"Found {total_orders} orders to update tracking status")
+        # First tracking ID of each order, as in update_single_order_tracking
+        ids_by_number = defaultdict(list)
+        for packing_slip_id, tracking_number in packing_slips:
+            ids_by_number[tracking_number].append(packing_slip_id)
 
-        if total_orders == 0:
+        if not ids_by_number:
             return {
                 'success': True,
+                'courier_code': courier_code,
                 'total_orders': 0,
-                'message': 'No pending orders to update'
+                'updated': 0,
+                'delivered': 0,
+                'message': 'No orders with tracking IDs to update'
             }
 
-        # Process each order asynchronously
-        results = {
+        api_key = _get_track123_api_key()
+        if not api_key:
+            logger.error("No Track123 API key found in active Google Drive settings")
+            return {
+                'success': False,
+                'courier_code': courier_code,
+                'error': 'No Track123 API key configured'
+            }
+
+        result = get_tracking_status_batch(api_key, list(ids_by_number), courier_code)
+        statuses = result.get('statuses', {})
+
+        # Group orders by new status, then write them all in one UPDATE instead
+        # of one save() per order (statuses carry the latest event, so they
+        # rarely repeat and an UPDATE per status would be nearly one per order)
+        ids_by_status = defaultdict(list)
+        for tracking_number, new_status in statuses.items():
+            ids_by_status[new_status].extend(ids_by_number.get(tracking_number, ()))
+
+        delivered_ids = [
+            pk for new_status, ids in ids_by_status.items() if new_status.lower() == 'delivered' for pk in ids
+        ]
+        updated = 0
+        if ids_by_status:
+            status_field = PackingSlip._meta.get_field('status')
+            updated = PackingSlip.objects.filter(
+                id__in=[pk for ids in ids_by_status.values() for pk in ids]
+            ).update(
+                tracking_status=Case(
+                    *(When(id__in=ids, then=Value(new_status)) for new_status, ids in ids_by_status.items()),
+                    default=F('tracking_status'),
+                ),
+                status=Case(
+                    When(id__in=delivered_ids, then=Value('delivered', output_field=status_field)),
+                    default=F('status'),
+                ),
+                updated_at=timezone.now(),
+            )
+        delivered = len(delivered_ids)
+
+        total_orders = sum(len(ids) for ids in ids_by_number.values())
+        logger.info(f"Updated tracking for {updated}/{total_orders} {courier_code} orders ({delivered} delivered)")
+
+        summary = {
+            'success': result.get('success', False),
+            'courier_code': courier_code,
             'total_orders': total_orders,
-            'updated': 0,
-            'skipped': 0,
-            'failed': 0,
-            'delivered': 0,
-            'errors': []
+            'updated': updated,
+            'delivered': delivered,
+        }
+        if not result.get('success'):
+            summary['error'] = result.get('error', 'Unknown error')
+            failed_ids = [
+                pk
+                for tracking_number, ids in ids_by_number.items() if tracking_number not in statuses
+                for pk in ids
+            ]
+            summary.update(_handle_batch_failure(failed_ids, courier_code, attempt, summary['error'], result.get('retryable', False)))
+        return summary
+
+    except Exception as e:
+        logger.error(f"Error updating tracking for {courier_code} batch: {str(e)}")
+        return {
+            'success': False,
+            'courier_code': courier_code,
+            'error': str(e)
         }
 
-        for packing_slip in pending_orders:
-            # Queue async task for each order
+
+def _handle_batch_failure(packing_slip_ids: List[int], courier_code: str, attempt: int,
+                          error: str, retryable: bool) -> Dict:
+    """
+    Schedule another attempt for a failed batch, or dead-letter its orders when
+    the error is permanent or the attempts are used up.
+
+    Returns:
+        Dict with 'retry_scheduled' or 'dead_lettered' to merge into the task result
+    """
+    if retryable and attempt < TRACKING_MAX_ATTEMPTS:
+        delay = _retry_delay(attempt)
+        schedule(
+            'masterdata.tracking_service.update_orders_tracking_batch',
+            packing_slip_ids,
+            courier_code,
+            attempt=attempt + 1,
+            hook='masterdata.tracking_service.update_tracking_batch_callback',
+            schedule_type=Schedule.ONCE,
+            next_run=timezone.now() + timedelta(seconds=delay)
+        )
+        logger.warning(f"Retrying {len(packing_slip_ids)} {courier_code} orders in {delay:.0f}s (attempt {attempt + 1}/{TRACKING_MAX_ATTEMPTS}): {error}")
+        return {'retry_scheduled': len(packing_slip_ids)}
+
+    # One row per slip: a slip that fails again on a later run gets its
+    # attempts added and its error refreshed instead of a duplicate row
+    existing = TrackingDeadLetter.objects.filter(packing_slip_id__in=packing_slip_ids)
+    existing_ids = set(existing.values_list('packing_slip_id', flat=True))
+    existing.update(
+        courier_code=courier_code,
+        error=error,
+        attempts=F('attempts') + attempt,
+        last_attempted_at=timezone.now()
+    )
+    TrackingDeadLetter.objects.bulk_create([
+        TrackingDeadLetter(packing_slip_id=pk, courier_code=courier_code, error=error, attempts=attempt)
+        for pk in packing_slip_ids if pk not in existing_ids
+    ], ignore_conflicts=True)
+    logger.error(f"Dead-lettered {len(packing_slip_ids)} {courier_code} orders after {attempt} attempt(s): {error}")
+    return {'dead_lettered': len(packing_slip_ids)}
+
+
+def requeue_dead_letters(dead_letters=None) -> Dict:
+    """
+    Queue the dead-lettered orders for another round of tracking updates and
+    clear them from the dead-letter table.
+
+    Args:
+        dead_letters: Optional TrackingDeadLetter queryset to re-queue (default: all)
+
+    Returns:
+        Dict with success status and the number of orders re-queued
+    """
+    try:
+        dead_letter_ids = []
+        ids_by_courier = defaultdict(set)
+        for dead_letter_id, packing_slip_id, courier_code in (dead_letters if dead_letters is not None else TrackingDeadLetter.objects.all()).values_list('id', 'packing_slip_id', 'courier_code'):
+            dead_letter_ids.append(dead_letter_id)
+            ids_by_courier[courier_code].add(packing_slip_id)
+
+        total_orders = 0
+        for courier_code, ids in ids_by_courier.items():
+            ids = sorted(ids)
+            for start in range(0, len(ids), QUERY_BATCH_SIZE):
+                async_task(
+                    'masterdata.tracking_service.update_orders_tracking_batch',
+                    ids[start:start + QUERY_BATCH_SIZE],
+                    courier_code,
+                    hook='masterdata.tracking_service.update_tracking_batch_callback'
+                )
+            total_orders += len(ids)
+
+        # Only the rows read above; anything dead-lettered meanwhile stays
+        TrackingDeadLetter.objects.filter(id__in=dead_letter_ids).delete()
+        logger.info(f"Re-queued {total_orders} dead-lettered orders")
+
+        return {
+            'success': True,
+            'total_orders': total_orders,
+            'message': f'Re-queued {total_orders} dead-lettered orders'
+        }
+
+    except Exception as e:
+        logger.error(f"Error re-queueing dead-lettered orders: {str(e)}")
+        return {
+            'success': False,
+            'error': str(e)
+        }
+
+
+def update_all_pending_orders() -> Dict:
+    """
+    Update tracking status for all orders that are shipped but not delivered.
+    This is the main function that should be scheduled with Django Q2.
+
+    Returns:
+        Dict with summary of updates
+    """
+    try:
+        # Query for shipped orders that have tracking info ('shipped' already rules out delivered)
+        pending_orders = PackingSlip.objects.pending_tracking().order_by()
+
+        def queue_batch(ids, courier_code):
+            # Queue async task for each batch of orders
             async_task(
-                'masterdata.tracking_service.update_single_order_tracking',
-                packing_slip.id,
-                hook='masterdata.tracking_service.update_tracking_callback'
+                'masterdata.tracking_service.update_orders_tracking_batch',
+                ids,
+                courier_code,
+                hook='masterdata.tracking_service.update_tracking_batch_callback'
             )
 
-        logger.info(f"Queued {total_orders} tracking update tasks")
+        # Stream (id, vendor) pairs instead of loading every order (or counting them
+        # first), grouping by courier so each task asks Track123 about a whole batch
+        total_orders = 0
+        task_count = 0
+        ids_by_courier = defaultdict(list)
+        for packing_slip_id, tracking_vendor in pending_orders.values_list('id', 'tracking_vendor').iterator(chunk_size=2000):
+            total_orders += 1
+            courier_code = tracking_vendor.lower()
+            ids = ids_by_courier[courier_code]
+            ids.append(packing_slip_id)
+            if len(ids) == QUERY_BATCH_SIZE:
+                queue_batch(ids_by_courier.pop(courier_code), courier_code)
+                task_count += 1
+
+        for courier_code, ids in ids_by_courier.items():
+            queue_batch(ids, courier_code)
+            task_count += 1
+
+        if total_orders == 0:
+            logger.info("Found 0 orders to update tracking status")
+            return {
+                'success': True,
+                'total_orders': 0,
+                'message': 'No pending orders to update'
+            }
+
+        logger.info(f"Queued {task_count} tracking update tasks for {total_orders} orders")
 
         return {
             'success': True,
             'total_orders': total_orders,
-            'message': f'Queued {total_orders} tracking update tasks'
+            'message': f'Queued {task_count} tracking update tasks for {total_orders} orders'
         }
 
     except Exception as e:
@@ -226,6 +459,63 @@ def update_tracking_callback(task):
         logger.error(f"Task failed: {task.result}")
 
 
+def update_tracking_batch_callback(task):
+    """
+    Callback function to log the result of batched tracking updates.
+
+    Args:
+        task: Django Q task object
+    """
+    if task.success:
+        result = task.result
+        if result.get('success'):
+            logger.info(f"Updated {result.get('updated')} {result.get('courier_code')} orders ({result.get('delivered')} marked as DELIVERED)")
+        elif result.get('retry_scheduled'):
+            logger.warning(f"Retry scheduled for {result.get('retry_scheduled')} {result.get('courier_code')} orders: {result.get('error')}")
+        else:
+            logger.error(f"Failed to update {result.get('courier_code')} orders: {result.get('error')}")
+    else:
+        logger.error(f"Task failed: {task.result}")
+
+
+TRACKING_SCHEDULE_FUNC = 'masterdata.tracking_service.update_all_pending_orders'
+TRACKING_SCHEDULE_NAME = 'tracking_status_updater'
+
+
+def _ensure_tracking_schedule(interval_minutes: int):
+    """
+    Get the tracking update schedule, creating it if missing.
+
+    Returns:
+        (Schedule, created) tuple
+    """
+    schedules = Schedule.objects.filter(func=TRACKING_SCHEDULE_FUNC, name=TRACKING_SCHEDULE_NAME).order_by('id')
+    existing_schedule = schedules.first()
+    if existing_schedule:
+        return existing_schedule, False
+
+    try:
+        new_schedule = schedule(
+            TRACKING_SCHEDULE_FUNC,
+            name=TRACKING_SCHEDULE_NAME,
+            schedule_type=Schedule.MINUTES,
+            minutes=interval_minutes,
+            repeats=-1  # Repeat indefinitely
+        )
+    except IntegrityError:
+        # schedule() refuses duplicate names: another process created it since our check
+        existing_schedule = schedules.first()
+        if existing_schedule is None:
+            raise
+        return existing_schedule, False
+
+    # schedule()'s name check isn't a constraint, so two processes can still both
+    # get past it; keep the oldest and drop the rest so they converge
+    kept_schedule = schedules.first()
+    schedules.exclude(id=kept_schedule.id).delete()
+    return kept_schedule, kept_schedule.id == new_schedule.id
+
+
 def schedule_tracking_updates(interval_minutes: int = 720):
     """
     Schedule periodic tracking updates using Django Q2 scheduler.
@@ -234,35 +524,22 @@ def schedule_tracking_updates(interval_minutes: int = 720):
         interval_minutes: How often to check for updates (default: 720 minutes / 12 hours)
     """
     try:
-        # Check if schedule already exists
-        existing_schedule = Schedule.objects.filter(
-            func='masterdata.tracking_service.update_all_pending_orders',
-            name='tracking_status_updater'
-        ).first()
+        tracking_schedule, created = _ensure_tracking_schedule(interval_minutes)
 
-        if existing_schedule:
+        if not created:
             logger.info("Tracking update schedule already exists")
             return {
                 'success': True,
                 'message': 'Schedule already exists',
-                'schedule_id': existing_schedule.id
+                'schedule_id': tracking_schedule.id
             }
 
-        # Create new schedule
-        schedule_id = schedule(
-            'masterdata.tracking_service.update_all_pending_orders',
-            name='tracking_status_updater',
-            schedule_type=Schedule.MINUTES,
-            minutes=interval_minutes,
-            repeats=-1  # Repeat indefinitely
-        )
-
-        logger.info(f"Created tracking update schedule with ID: {schedule_id}")
+        logger.info(f"Created tracking update schedule with ID: {tracking_schedule.id}")
 
         return {
             'success': True,
             'message': f'Scheduled tracking updates every {interval_minutes} minutes',
-            'schedule_id': schedule_id
+            'schedule_id': tracking_schedule.id
         }
 
     except Exception as e:
@@ -278,10 +555,7 @@ def cancel_tracking_schedule():
     Cancel the scheduled tracking updates.
     """
     try:
-        schedules = Schedule.objects.filter(
-            func='masterdata.tracking_service.update_all_pending_orders',
-            name='tracking_status_updater'
-        )
+        schedules = Schedule.objects.filter(func=TRACKING_SCHEDULE_FUNC, name=TRACKING_SCHEDULE_NAME)
 
         count = schedules.count()
         schedules.delete()
@@ -354,31 +628,25 @@ def auto_start_tracking_scheduler():
         Dict with success status and message
     """
     try:
-        # Check if schedule already exists
-        existing_schedule = Schedule.objects.filter(
-            func='masterdata.tracking_service.update_all_pending_orders',
-            name='tracking_status_updater'
-        ).first()
+        # Auto-start with default 12-hour interval (a no-op if the schedule exists)
+        tracking_schedule, created = _ensure_tracking_schedule(interval_minutes=720)
 
-        if existing_schedule:
+        if not created:
             logger.info("Tracking scheduler already running - auto-start skipped")
             return {
                 'success': True,
                 'message': 'Scheduler already active',
-                'schedule_id': existing_schedule.id,
+                'schedule_id': tracking_schedule.id,
                 'auto_started': False
             }
 
-        # Auto-start with default 12-hour interval
-        result = schedule_tracking_updates(interval_minutes=720)
-        
-        if result.get('success'):
-            logger.info("Tracking scheduler auto-started successfully with 12-hour interval")
-            result['auto_started'] = True
-            return result
-        else:
-            logger.error(f"Failed to auto-start tracking scheduler: {result.get('error')}")
-            return result
+        logger.info("Tracking scheduler auto-started successfully with 12-hour interval")
+        return {
+            'success': True,
+            'message': 'Scheduled tracking updates every 720 minutes',
+            'schedule_id': tracking_schedule.id,
+            'auto_started': True
+        }
 
     except Exception as e:
         logger.error(f"Error in auto-start tracking scheduler: {str(e)}")
@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import (
+    TrackingSchedulerView,
+    TrackingUpdateView
+)
+
+# Included under tracking/ (Django Q2 tracking service)
+urlpatterns = [
+    path('update/', TrackingUpdateView.as_view(), name='tracking-update'),
+    path('scheduler/', TrackingSchedulerView.as_view(), name='tracking-scheduler'),
+]
@@ -1,79 +1,79 @@
-from django.urls import path, include
-from rest_framework.routers import DefaultRouter
+from importlib import import_module
+
+from django.urls import path, include, register_converter
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
+from .converters import DriveFileIdConverter
 from .views import (
-    EMBHubDriveAccountsView,
-    EMBHubFolderTreeView,
-    EMBHubCreateFolderView,
-    EMBHubDeleteFolderView,
-    EMBHubUploadFileView,
-    EMBHubDeleteFileView,
-    EMBHubListFolderContentsView,
-    EMBHubSearchView,
-    EMBHubRunAutomationView,
     ProductViewSet,
     AccountViewSet,
     ExpenseViewSet,
-    PackingSlipsUploadView,
     PackingSlipsViewSet,
     ShippingLabelsUploadView,
-    FileViewerView,
-    DashboardKPIView,
-    DashboardCustomerProfitAnalysisView,
-    DashboardSKUAnalysisView,
-    OrdersByStatusView,
-    ProductAnalyticsView,
-    PackingSlipPrintView,
-    PackingSlipBulkPrintView,
-    PackingSlipFetchTrackingStatusView,
-    TrackingSchedulerView,
-    TrackingUpdateView
+    FileViewerView
 )
 
-router = DefaultRouter(trailing_slash=False)
-router.register("products", ProductViewSet, 'products')
-router.register("accounts", AccountViewSet, 'accounts')
-router.register("expenses", ExpenseViewSet, 'expenses')
-router.register("packing-slips", PackingSlipsViewSet, 'packing-slips')
+register_converter(DriveFileIdConverter, 'drive_id')
+
+# ViewSet routes are spelled out rather than generated by a DefaultRouter, which
+# also adds a format-suffix twin of every route and an API root view
+LIST_ACTIONS = {'get': 'list', 'post': 'create'}
+DETAIL_ACTIONS = {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'}
+
+# How long a dashboard response is reused before its queries run again
+READ_ONLY_CACHE_TTL = 120  # seconds
+
+
+def cached_include(module, ttl):
+    """
+    include() for a URLconf of GET-only routes, caching each 200 response for
+    ttl seconds per URL (query string included) and per Authorization header,
+    so one user's cached data is never served to another or to anonymous callers
+    """
+    return include([
+        path(str(pattern.pattern), cache_page(ttl)(vary_on_headers('Authorization')(pattern.callback)), name=pattern.name)
+        for pattern in import_module(module).urlpatterns
+    ])
+
 
+# resolve() tries these in order, so the most-requested endpoints go first.
+# None of these overlap (the ViewSet routes have no trailing slash), so moving
+# them around doesn't change which view a URL reaches. Groups sharing a prefix
+# live in their own module, so a URL outside the prefix skips the whole group
 urlpatterns = [
-    # Product Management
-    path("", include(router.urls)),
+    # Dashboard KPIs
+    path('dashboard/', cached_include('masterdata.dashboard_urls', READ_ONLY_CACHE_TTL)),
     
-    # EMB HUB Google Drive Management
-    path('emb-hub/accounts/', EMBHubDriveAccountsView.as_view(), name='emb-hub-accounts'),
-    path('emb-hub/tree/', EMBHubFolderTreeView.as_view(), name='emb-hub-folder-tree'),
-    path('emb-hub/folder/create/', EMBHubCreateFolderView.as_view(), name='emb-hub-create-folder'),
-    path('emb-hub/folder/delete/', EMBHubDeleteFolderView.as_view(), name='emb-hub-delete-folder'),
-    path('emb-hub/folder/contents/', EMBHubListFolderContentsView.as_view(), name='emb-hub-folder-contents'),
-    path('emb-hub/file/upload/', EMBHubUploadFileView.as_view(), name='emb-hub-upload-file'),
-    path('emb-hub/file/delete/', EMBHubDeleteFileView.as_view(), name='emb-hub-delete-file'),
-    path('emb-hub/search/', EMBHubSearchView.as_view(), name='emb-hub-search'),
-    path('emb-hub/run-automation/', EMBHubRunAutomationView.as_view(), name='emb-hub-run-automation'),
+    # Orders by status and product analytics
+    path('', cached_include('masterdata.read_only_urls', READ_ONLY_CACHE_TTL)),
+
+    # Tracking Service (Django Q2)
+    path('tracking/', include('masterdata.tracking_urls')),
     
     # Packing Slips
-    path('packing-slips/upload/', PackingSlipsUploadView.as_view(), name='packing-slips-upload'),
-    path('packing-slips/<int:packing_slip_id>/print/', PackingSlipPrintView.as_view(), name='packing-slip-print'),
-    path('packing-slips/bulk-print/', PackingSlipBulkPrintView.as_view(), name='packing-slip-bulk-print'),
-    path('packing-slips/<int:packing_slip_id>/fetch-tracking-status/', PackingSlipFetchTrackingStatusView.as_view(), name='packing-slip-fetch-tracking-status'),
+    path('packing-slips', PackingSlipsViewSet.as_view(LIST_ACTIONS), name='packing-slips-list'),
+    path('packing-slips/', include('masterdata.packing_slips_urls')),
+    
+    # Product Management
+    path('products', ProductViewSet.as_view(LIST_ACTIONS), name='products-list'),
+    path('products/<int:pk>', ProductViewSet.as_view(DETAIL_ACTIONS), name='products-detail'),
+    path('products/template', ProductViewSet.as_view({'get': 'download_template'}), name='products-download-template'),
+    path('products/bulk-create', ProductViewSet.as_view({'post': 'bulk_create_products'}), name='products-bulk-create-products'),
+
+    # Account Management
+    path('accounts', AccountViewSet.as_view(LIST_ACTIONS), name='accounts-list'),
+    path('accounts/<int:pk>', AccountViewSet.as_view(DETAIL_ACTIONS), name='accounts-detail'),
+
+    # Expense Management
+    path('expenses', ExpenseViewSet.as_view(LIST_ACTIONS), name='expenses-list'),
+    path('expenses/<int:pk>', ExpenseViewSet.as_view(DETAIL_ACTIONS), name='expenses-detail'),
     
     # Shipping Labels
     path('shipping-labels/upload/', ShippingLabelsUploadView.as_view(), name='shipping-labels-upload'),
     
-    # File Viewer
-    path('file/<str:file_id>/', FileViewerView.as_view(), name='file-viewer'),
-    
-    # Dashboard KPIs
-    path('dashboard/kpis/', DashboardKPIView.as_view(), name='dashboard-kpis'),
-    path('dashboard/customer-profit-analysis/', DashboardCustomerProfitAnalysisView.as_view(), name='dashboard-customer-profit-analysis'),
-    path('dashboard/sku-analysis/', DashboardSKUAnalysisView.as_view(), name='dashboard-sku-analysis'),
-    
-    # Orders
-    path('orders/by-status/', OrdersByStatusView.as_view(), name='orders-by-status'),
+    # EMB HUB Google Drive Management
+    path('emb-hub/', include('masterdata.emb_hub_urls')),
     
-    # Product Analytics
-    path('product/analytics/', ProductAnalyticsView.as_view(), name='product-analytics'),
-
-    # Tracking Service (Django Q2)
-    path('tracking/scheduler/', TrackingSchedulerView.as_view(), name='tracking-scheduler'),
-    path('tracking/update/', TrackingUpdateView.as_view(), name='tracking-update'),
-] 
\ No newline at end of file
+    # File Viewer
+    path('file/<drive_id:file_id>/', FileViewerView.as_view(), name='file-viewer'),
+]
@@ -7,7 +7,6 @@ from datetime import datetime
 from io import BytesIO
 from django.http import HttpResponse
 from rest_framework.decorators import action
-import openpyxl
 from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.response import Response
@@ -15,22 +14,16 @@ from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
 from back_sinan.custom_methods import isAuthenticatedCustom
 from .google_drive_service import GoogleDriveService
+from .prefetch import AutoPrefetchViewSetMixin, requested_fields, serializer_relations
 from .track123_service import import_tracking_to_track123, get_tracking_status
 from users.models import GoogleDriveSettings, UserActivities
-from .models import Product, Account, PackingSlip, File
+from .models import Product, Account, PackingSlip, File, STATUS_LABELS
 from .serializers import ProductSerializer, AccountSerializer, PackingSlipSerializer, FileSerializer, ExpenseSerializer
 
 logger = logging.getLogger(__name__)
 
-# PDF generation imports
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_LEFT, TA_CENTER
-from reportlab.lib import colors
-from PIL import Image as PILImage
-import fitz  # PyMuPDF for PDF processing
+# openpyxl, reportlab, PIL and PyMuPDF take a few hundred ms to import, so the
+# views that build spreadsheets/PDFs import them when first called, like PDFProcessor
 
 class EMBHubDriveAccountsView(APIView):
     """Get available Google Drive accounts"""
@@ -74,10 +67,54 @@ class EMBHubFolderTreeView(APIView):
                 'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
 
-class EMBHubCreateFolderView(APIView):
-    """Create a new folder"""
+class EMBHubFolderView(APIView):
+    """
+    Folders: GET lists a folder's contents (the root without folder_id), POST
+    creates one, DELETE deletes one. GET and DELETE take query parameters
+    """
     permission_classes = (isAuthenticatedCustom,)
 
+    def get(self, request):
+        try:
+            email = request.query_params.get('google_drive_email')
+            folder_id = request.query_params.get('folder_id')  # Optional, if None will get root
+            
+            logger.debug("EMBHubFolderView.get: email=%s, folder_id=%s", email, folder_id)
+            
+            if not email:
+                return Response({
+                    'error': 'Google Drive email is required'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            service = GoogleDriveService(email)
+            
+            if folder_id:
+                logger.debug("Loading contents for folder_id: %s", folder_id)
+                folders, files = service.list_folder_contents(folder_id)
+                path = service.get_folder_path(folder_id)
+                logger.debug("Folder path: %s", path)
+            else:
+                logger.debug("Loading root folder contents")
+                # Get root folder
+                root_folder = service.get_root_folder()
+                logger.debug("Root folder: %s", root_folder)
+                folders, files = service.list_folder_contents(root_folder['id'])
+                path = [root_folder]
+            
+            logger.debug("Found %d folders and %d files", len(folders), len(files))
+            
+            return Response({
+                'success': True,
+                'folders': folders,
+                'files': files,
+                'path': path
+            })
+        except Exception as e:
+            logger.exception("Error in EMBHubFolderView.get")
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
     def post(self, request):
         try:
             email = request.data.get('google_drive_email')
@@ -114,14 +151,10 @@ class EMBHubCreateFolderView(APIView):
                 'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
 
-class EMBHubDeleteFolderView(APIView):
-    """Delete a folder"""
-    permission_classes = (isAuthenticatedCustom,)
-
-    def post(self, request):
+    def delete(self, request):
         try:
-            email = request.data.get('google_drive_email')
-            folder_id = request.data.get('folder_id')
+            email = request.query_params.get('google_drive_email')
+            folder_id = request.query_params.get('folder_id')
             
             if not email:
                 return Response({
@@ -151,24 +184,22 @@ class EMBHubDeleteFolderView(APIView):
                 'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
 
-class EMBHubUploadFileView(APIView):
-    """Upload a file to a folder"""
+class EMBHubFileView(APIView):
+    """Files: POST uploads one to a folder (multipart), DELETE ?file_id= deletes one"""
     permission_classes = (isAuthenticatedCustom,)
     parser_classes = (MultiPartParser, FormParser)
 
     def post(self, request):
-        print(f"=== EMBHubUploadFileView called ===")
-        print(f"Request method: {request.method}")
-        print(f"Request FILES: {list(request.FILES.keys())}")
+        logger.debug("EMBHubFileView upload: FILES=%s", list(request.FILES.keys()))
         
         try:
             email = request.data.get('google_drive_email')
             folder_id = request.data.get('folder_id')
             uploaded_file = request.FILES.get('file')
             
-            print(f"Email: {email}")
-            print(f"Folder ID: {folder_id}")
-            print(f"Uploaded file: {uploaded_file.name if uploaded_file else None}")
+            logger.debug("Email: %s", email)
+            logger.debug("Folder ID: %s", folder_id)
+            logger.debug("Uploaded file: %s", uploaded_file.name if uploaded_file else None)
             
             if not email:
                 return Response({
@@ -398,8 +429,9 @@ class EMBHubUploadFileView(APIView):
             print(f"Parent folder path for matching: '{parent_folder_path}'")
             
             # Get packing slips that share the same parent folder path
+            # (paths are built from the same Drive folders, so a prefix match can use the index)
             packing_slips = list(PackingSlip.objects.filter(
-                folder_path__icontains=parent_folder_path
+                folder_path__startswith=parent_folder_path
             ).values('id', 'ship_to', 'order_id', 'folder_path'))
             print(f"Retrieved {len(packing_slips)} packing slips from matching folder path")
             
@@ -828,15 +860,10 @@ class EMBHubUploadFileView(APIView):
             print(f"Error extracting label data: {str(e)}")
             return None
 
-
-class EMBHubDeleteFileView(APIView):
-    """Delete a file"""
-    permission_classes = (isAuthenticatedCustom,)
-
-    def post(self, request):
+    def delete(self, request):
         try:
-            email = request.data.get('google_drive_email')
-            file_id = request.data.get('file_id')
+            email = request.query_params.get('google_drive_email')
+            file_id = request.query_params.get('file_id')
             
             if not email:
                 return Response({
@@ -866,60 +893,6 @@ class EMBHubDeleteFileView(APIView):
                 'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
 
-class EMBHubListFolderContentsView(APIView):
-    """List contents of a specific folder"""
-    permission_classes = (isAuthenticatedCustom,)
-
-    def post(self, request):
-        try:
-            email = request.data.get('google_drive_email')
-            folder_id = request.data.get('folder_id')  # Optional, if None will get root
-            
-            print(f"EMBHubListFolderContentsView: email={email}, folder_id={folder_id}")
-            
-            if not email:
-                print("Error: Google Drive email is required")
-                return Response({
-                    'error': 'Google Drive email is required'
-                }, status=status.HTTP_400_BAD_REQUEST)
-
-            print(f"Initializing GoogleDriveService for email: {email}")
-            service = GoogleDriveService(email)
-            print("GoogleDriveService initialized successfully")
-            
-            if folder_id:
-                print(f"Loading contents for folder_id: {folder_id}")
-                folders = service.list_folders(folder_id)
-                files = service.list_files(folder_id)
-                path = service.get_folder_path(folder_id)
-                print(f"Folder path: {path}")
-            else:
-                print("Loading root folder contents")
-                # Get root folder
-                root_folder = service.get_root_folder()
-                print(f"Root folder: {root_folder}")
-                folders = service.list_folders(root_folder['id'])
-                files = service.list_files(root_folder['id'])
-                path = [root_folder]
-            
-            print(f"Found {len(folders)} folders and {len(files)} files")
-            print(f"Folders: {[f['name'] for f in folders]}")
-            print(f"Files: {[f['name'] for f in files]}")
-            
-            return Response({
-                'success': True,
-                'folders': folders,
-                'files': files,
-                'path': path
-            })
-        except Exception as e:
-            print(f"Error in EMBHubListFolderContentsView: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return Response({
-                'error': str(e)
-            }, status=status.HTTP_400_BAD_REQUEST)
-
 class EMBHubSearchView(APIView):
     """Search for files"""
     permission_classes = (isAuthenticatedCustom,)
@@ -964,7 +937,7 @@ def add_user_activity(user, action):
     )
 
 
-class ProductViewSet(ModelViewSet):
+class ProductViewSet(AutoPrefetchViewSetMixin, ModelViewSet):
     """
     A viewset that provides default `create()`, `retrieve()`, `update()`,
     `partial_update()`, `destroy()` and `list()` actions for Product model.
@@ -976,6 +949,8 @@ class ProductViewSet(ModelViewSet):
     @action(detail=False, methods=['get'], url_path='template')
     def download_template(self, request):
         """Download Excel template for bulk product upload"""
+        import openpyxl
+
         wb = openpyxl.Workbook()
         ws = wb.active
         ws.title = "Product Template"
@@ -1022,7 +997,7 @@ class ProductViewSet(ModelViewSet):
         add_user_activity(self.request.user, f"deleted product: {product_name}")
 
 
-class AccountViewSet(ModelViewSet):
+class AccountViewSet(AutoPrefetchViewSetMixin, ModelViewSet):
     """
     A viewset that provides default `create()`, `retrieve()`, `update()`,
     `partial_update()`, `destroy()` and `list()` actions for Account model.
@@ -1048,14 +1023,14 @@ class AccountViewSet(ModelViewSet):
         add_user_activity(self.request.user, f"deleted account: {account_name}")
 
 
-class ExpenseViewSet(ModelViewSet):
+class ExpenseViewSet(AutoPrefetchViewSetMixin, ModelViewSet):
     """CRUD operations for expenses"""
     permission_classes = (isAuthenticatedCustom,)
     serializer_class = ExpenseSerializer
     
     def get_queryset(self):
         from .models import Expense
-        return Expense.objects.select_related('account').all()
+        return Expense.objects.all()
     
     def perform_create(self, serializer):
         """Override to add user activity logging"""
@@ -1112,30 +1087,53 @@ class EMBHubRunAutomationView(APIView):
             created_folders = []
             errors = []
             
-            # Create subfolders for each account
-            for account in accounts:
-                try:
-                    # Create account folder
-                    account_folder = service.create_folder(account.account_name, date_folder['id'])
-                    
-                    # Create the 4 required subfolders
-                    subfolder_names = ['DST', 'Shipping Labels', 'Packing Slips', 'Pick Lists']
-                    account_subfolders = []
-                    
-                    for subfolder_name in subfolder_names:
-                        subfolder = service.create_folder(subfolder_name, account_folder['id'])
-                        account_subfolders.append(subfolder['name'])
-                    
-                    created_folders.append({
+            # Create all account folders in one batched request
+            accounts = list(accounts)
+            account_folders = service.create_folders(
+                [(account.account_name, date_folder['id']) for account in accounts]
+            )
+            
+            # Create the 4 required subfolders for every account in one batched request
+            subfolder_names = ['DST', 'Shipping Labels', 'Packing Slips', 'Pick Lists']
+            subfolder_requests = []
+            for account, account_folder in zip(accounts, account_folders):
+                if isinstance(account_folder, Exception):
+                    errors.append({
                         'account_name': account.account_name,
-                        'account_folder_id': account_folder['id'],
-                        'subfolders': account_subfolders
+                        'error': str(account_folder)
                     })
-                    
-                except Exception as e:
+                    continue
+                for subfolder_name in subfolder_names:
+                    subfolder_requests.append((account, account_folder, subfolder_name))
+            
+            subfolders = service.create_folders(
+                [(subfolder_name, account_folder['id']) for _, account_folder, subfolder_name in subfolder_requests]
+            )
+            
+            account_results = {}
+            for (account, account_folder, _), subfolder in zip(subfolder_requests, subfolders):
+                account_result = account_results.setdefault(account.id, {
+                    'account': account,
+                    'account_folder': account_folder,
+                    'subfolders': [],
+                    'error': None
+                })
+                if isinstance(subfolder, Exception):
+                    account_result['error'] = account_result['error'] or str(subfolder)
+                else:
+                    account_result['subfolders'].append(subfolder['name'])
+            
+            for account_result in account_results.values():
+                if account_result['error']:
                     errors.append({
-                        'account_name': account.account_name,
-                        'error': str(e)
+                        'account_name': account_result['account'].account_name,
+                        'error': account_result['error']
+                    })
+                else:
+                    created_folders.append({
+                        'account_name': account_result['account'].account_name,
+                        'account_folder_id': account_result['account_folder']['id'],
+                        'subfolders': account_result['subfolders']
                     })
             
             # Log the automation activity
@@ -1342,7 +1340,7 @@ class PackingSlipsUploadView(APIView):
             return None
 
 
-class PackingSlipsViewSet(ModelViewSet):
+class PackingSlipsViewSet(AutoPrefetchViewSetMixin, ModelViewSet):
     """CRUD operations for packing slips"""
     queryset = PackingSlip.objects.all()
     serializer_class = PackingSlipSerializer
@@ -1351,6 +1349,13 @@ class PackingSlipsViewSet(ModelViewSet):
     def get_queryset(self):
         queryset = PackingSlip.objects.all()
         
+        # Join the product / prefetch files only when the (?fields=) requested fields read them
+        select, prefetch = serializer_relations(PackingSlipSerializer, requested_fields(self.request))
+        if 'product' in select:
+            queryset = queryset.with_product()
+        if 'files' in prefetch:
+            queryset = queryset.with_files()
+        
         # Filter by order_id if provided
         order_id = self.request.query_params.get('order_id', None)
         if order_id:
@@ -1390,11 +1395,7 @@ class PackingSlipsViewSet(ModelViewSet):
             
             if gdrive_settings and gdrive_settings.track123_api_key:
                 # Parse tracking IDs (can be comma-separated)
-                tracking_numbers = [
-                    tid.strip() 
-                    for tid in new_tracking_ids.split(',') 
-                    if tid.strip()
-                ]
+                tracking_numbers = packing_slip.tracking_numbers
                 
                 if tracking_numbers:
                     # Call Track123 API
@@ -1563,11 +1564,7 @@ class PackingSlipFetchTrackingStatusView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             # Get the first tracking number (in case there are multiple)
-            tracking_numbers = [
-                tid.strip() 
-                for tid in packing_slip.tracking_ids.split(',') 
-                if tid.strip()
-            ]
+            tracking_numbers = packing_slip.tracking_numbers
             
             if not tracking_numbers:
                 return Response({
@@ -1594,7 +1591,7 @@ class PackingSlipFetchTrackingStatusView(APIView):
                     logger.warning(f"Generic status returned. Full API response: {result.get('data')}")
                 
                 packing_slip.tracking_status = new_status
-                packing_slip.save()
+                packing_slip.save(update_fields=['tracking_status', 'updated_at'])
                 
                 # Log the activity
                 add_user_activity(
@@ -1739,20 +1736,18 @@ class FileViewerView(APIView):
             # Get file info first
             file_info = service.get_file_info(file_id)
             
-            # Get file content
-            file_content = service.get_file_content(file_id)
-            
-            # Create HTTP response with file content
-            from django.http import HttpResponse
-            response = HttpResponse(
-                file_content,
+            # Stream file content straight from Drive instead of buffering it in memory
+            from django.http import StreamingHttpResponse
+            response = StreamingHttpResponse(
+                service.iter_file_content(file_id),
                 content_type=file_info.get('mimeType', 'application/octet-stream')
             )
             
             # Set filename in response headers
             filename = file_info.get('name', f'file_{file_id}')
             response['Content-Disposition'] = f'inline; filename="{filename}"'
-            response['Content-Length'] = len(file_content)
+            if file_info.get('size'):
+                response['Content-Length'] = file_info['size']
             
             return response
             
@@ -1918,9 +1913,8 @@ class DashboardKPIView(APIView):
         ).order_by('-count')
         
         # Add readable status names
-        status_mapping = dict(PackingSlip.STATUS_CHOICES)
         for item in status_data:
-            item['status_display'] = status_mapping.get(item['status'], item['status'])
+            item['status_display'] = STATUS_LABELS.get(item['status'], item['status'])
         
         return list(status_data)
     
@@ -2362,13 +2356,15 @@ class OrdersByStatusView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
             
             # Get orders with the specified status
-            orders = PackingSlip.objects.filter(status=status_filter).select_related('product').order_by('-created_at')
+            orders = PackingSlip.objects.with_product().summaries('ship_to', 'customizations').filter(
+                status=status_filter
+            ).order_by('-created_at')
             
             # Format the data for the frontend
             orders_data = []
             for order in orders:
                 # Get status display name
-                status_display = dict(PackingSlip.STATUS_CHOICES).get(order.status, order.status)
+                status_display = STATUS_LABELS.get(order.status, order.status)
                 
                 # Calculate total price (sales_price + shipping_price)
                 total_price = float((order.sales_price or 0) + (order.shipping_price or 0))
@@ -2522,26 +2518,45 @@ class ProductAnalyticsView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-class PackingSlipBulkPrintView(APIView):
-    """Generate bulk PDF with multiple packing slips"""
+class PackingSlipPrintView(APIView):
+    """
+    Generate a PDF with each packing slip's shipping label and packing slip page.
+    GET ?ids=1,2,3 (one id for a single slip), or POST {"ids": [...]} when the
+    selection is too long for a query string
+    """
     permission_classes = (isAuthenticatedCustom,)
 
+    def get(self, request):
+        return self.render_pdf(request.query_params.get('ids', '').split(','))
+
     def post(self, request):
+        return self.render_pdf(request.data.get('ids') or [])
+
+    def render_pdf(self, raw_ids):
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.units import inch
+        from reportlab.platypus import SimpleDocTemplate, PageBreak
+        from reportlab.lib.styles import getSampleStyleSheet
+
         try:
-            # Get the list of packing slip IDs
-            packing_slip_ids = request.data.get('packing_slip_ids', [])
-            
-            if not packing_slip_ids:
-                return Response({
-                    'error': 'No packing slip IDs provided'
-                }, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Get all packing slips
-            packing_slips = PackingSlip.objects.filter(id__in=packing_slip_ids)
-            
-            if not packing_slips.exists():
+            packing_slip_ids = [int(packing_slip_id) for packing_slip_id in raw_ids if str(packing_slip_id).strip()]
+        except (TypeError, ValueError):
+            return Response({
+                'error': 'ids must be a list of packing slip IDs'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if not packing_slip_ids:
+            return Response({
+                'error': 'No packing slip IDs provided'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # Slips with their product and files in three queries, however many are printed
+            packing_slips = list(PackingSlip.objects.with_product().with_files().filter(id__in=packing_slip_ids))
+
+            if not packing_slips:
                 return Response({
-                    'error': 'No packing slips found'
+                    'error': 'Packing slip not found' if len(packing_slip_ids) == 1 else 'No packing slips found'
                 }, status=status.HTTP_404_NOT_FOUND)
             
             # Create PDF buffer
@@ -2557,25 +2572,20 @@ class PackingSlipBulkPrintView(APIView):
             
             # Process each packing slip
             for i, packing_slip in enumerate(packing_slips):
-                print(f"Processing packing slip {i+1}/{len(packing_slips)}: Order {packing_slip.order_id}")
-                
-                # Add shipping label page first (if available)
-                shipping_labels = packing_slip.files.filter(file_type='shipping_label')
-                if shipping_labels.exists():
-                    # Use the existing single print view method
-                    single_print_view = PackingSlipPrintView()
-                    elements.extend(single_print_view.add_shipping_label_page(shipping_labels.first(), styles))
+                # Add shipping label page first (if available); files are newest first
+                shipping_label = next(
+                    (f for f in packing_slip.files.all() if f.file_type == 'shipping_label'), None
+                )
+                if shipping_label:
+                    elements.extend(self.add_shipping_label_page(shipping_label, styles))
                     # Add page break after shipping label
-                    from reportlab.platypus import PageBreak
                     elements.append(PageBreak())
                 
                 # Add packing slip page
-                single_print_view = PackingSlipPrintView()
-                elements.extend(single_print_view.create_packing_slip_page(packing_slip, styles))
+                elements.extend(self.create_packing_slip_page(packing_slip, styles))
                 
                 # Add page break between different orders (except for the last one)
                 if i < len(packing_slips) - 1:
-                    from reportlab.platypus import PageBreak
                     elements.append(PageBreak())
             
             # Build PDF
@@ -2586,75 +2596,31 @@ class PackingSlipBulkPrintView(APIView):
             buffer.close()
             
             # Create response
+            if len(packing_slips) == 1:
+                filename = f"packing_slip_{packing_slips[0].order_id}.pdf"
+            else:
+                filename = f"bulk_packing_slips_{len(packing_slips)}_orders.pdf"
             response = HttpResponse(pdf_data, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="bulk_packing_slips_{len(packing_slips)}_orders.pdf"'
-            
-            return response
-            
-        except Exception as e:
-            print(f"Error in bulk print: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return Response({
-                'error': str(e)
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
-class PackingSlipPrintView(APIView):
-    """Generate PDF with shipping label and packing slip"""
-    permission_classes = (isAuthenticatedCustom,)
-
-    def get(self, request, packing_slip_id):
-        try:
-            # Get the packing slip
-            packing_slip = PackingSlip.objects.get(id=packing_slip_id)
-            
-            # Create PDF buffer
-            buffer = BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=0.5*inch, 
-                                  leftMargin=0.5*inch, topMargin=0.5*inch, bottomMargin=0.5*inch)
-            
-            # Container for the 'Flowable' objects
-            elements = []
-            
-            # Get styles
-            styles = getSampleStyleSheet()
-            
-            # Add shipping label page first (if available)
-            shipping_labels = packing_slip.files.filter(file_type='shipping_label')
-            if shipping_labels.exists():
-                elements.extend(self.add_shipping_label_page(shipping_labels.first(), styles))
-                # Add page break after shipping label
-                from reportlab.platypus import PageBreak
-                elements.append(PageBreak())
-            
-            # Add packing slip page
-            elements.extend(self.create_packing_slip_page(packing_slip, styles))
-            
-            # Build PDF
-            doc.build(elements)
-            
-            # Get PDF data
-            pdf_data = buffer.getvalue()
-            buffer.close()
-            
-            # Create response
-            response = HttpResponse(pdf_data, content_type='application/pdf')
-            response['Content-Disposition'] = f'attachment; filename="packing_slip_{packing_slip.order_id}.pdf"'
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
             
             return response
             
-        except PackingSlip.DoesNotExist:
-            return Response({
-                'error': 'Packing slip not found'
-            }, status=status.HTTP_404_NOT_FOUND)
         except Exception as e:
+            logger.error(f"Error generating packing slip PDF: {str(e)}")
             return Response({
                 'error': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def add_shipping_label_page(self, shipping_label_file, styles):
         """Add shipping label page from PDF using Google Drive service"""
+        import fitz  # PyMuPDF for PDF processing
+        from PIL import Image as PILImage
+        from reportlab.lib import colors
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import Paragraph, Spacer, Image
+
         elements = []
         
         try:
@@ -2778,6 +2744,11 @@ class PackingSlipPrintView(APIView):
 
     def create_packing_slip_page(self, packing_slip, styles):
         """Create packing slip page with specified format"""
+        from reportlab.lib.enums import TA_CENTER
+        from reportlab.lib.styles import ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.platypus import Paragraph, Spacer
+
         elements = []
         
         # Custom styles - Increased font sizes
@@ -2850,11 +2821,14 @@ class TrackingSchedulerView(APIView):
 
     def post(self, request):
         from masterdata.tracking_service import (
+            TRACKING_SCHEDULE_FUNC,
+            TRACKING_SCHEDULE_NAME,
             schedule_tracking_updates,
             cancel_tracking_schedule,
             trigger_immediate_update
         )
         from django_q.models import Schedule
+        from django_q.tasks import count_group
 
         action = request.data.get('action')
 
@@ -2884,12 +2858,11 @@ class TrackingSchedulerView(APIView):
             return Response(result)
 
         elif action == 'status':
-            schedules = Schedule.objects.filter(
-                func='masterdata.tracking_service.update_all_pending_orders',
-                name='tracking_status_updater'
-            )
+            schedules = list(Schedule.objects.filter(func=TRACKING_SCHEDULE_FUNC, name=TRACKING_SCHEDULE_NAME))
 
-            if schedules.exists():
+            if schedules:
+                # The cluster groups a schedule's tasks under its name, so one count covers them
+                task_count = count_group(TRACKING_SCHEDULE_NAME)
                 schedule_info = []
                 for schedule in schedules:
                     schedule_info.append({
@@ -2898,7 +2871,7 @@ class TrackingSchedulerView(APIView):
                         'interval_minutes': schedule.minutes,
                         'next_run': schedule.next_run,
                         'repeats': 'Indefinitely' if schedule.repeats == -1 else schedule.repeats,
-                        'task_count': schedule.task_count()
+                        'task_count': task_count
                     })
 
                 return Response({
@@ -2931,12 +2904,12 @@ class TrackingUpdateView(APIView):
     POST /api/masterdata/tracking/update/
         - order_id: string (optional) - Update specific order
         - packing_slip_id: int (optional) - Update specific packing slip
-        - If neither provided, updates all pending orders
+        - If neither provided, queues an update of all pending orders and returns its task ID
     """
     permission_classes = (isAuthenticatedCustom,)
 
     def post(self, request):
-        from masterdata.tracking_service import update_single_order_tracking, update_all_pending_orders
+        from masterdata.tracking_service import update_single_order_tracking, trigger_immediate_update
         from masterdata.models import PackingSlip
 
         order_id = request.data.get('order_id')
@@ -2966,7 +2939,7 @@ class TrackingUpdateView(APIView):
                     'error': f'Order {order_id} not found'
                 }, status=status.HTTP_404_NOT_FOUND)
 
-        # Update all pending orders
+        # Update all pending orders; the scan and batch queueing run on the cluster, not this request
         else:
-            result = update_all_pending_orders()
+            result = trigger_immediate_update()
             return Response(result)
@@ -4,11 +4,12 @@ from .views import(CreateUserView,LoginView,UpdatePasswordView,MeView,UserActivi
 from .views import(ForgotPasswordView,ResetPasswordView)
 from .views import(CreateGoogleDriveSettingsView,GoogleDriveSettingsView)
 
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from django.urls import path
 from django.urls.conf import include
 
-router=DefaultRouter(trailing_slash=False)
+# SimpleRouter: no .<format> suffix twin of every route and no API root view
+router=SimpleRouter(trailing_slash=False)
 
 router.register("create-user",CreateUserView,'create-user')
 router.register("login",LoginView,'login')
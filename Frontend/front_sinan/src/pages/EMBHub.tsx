@@ -14,9 +14,8 @@ import axios from 'axios';
 import { getAuthToken } from '../utils/functions';
 import { AuthTokenType, DriveAccount, DriveFolder, DriveFile, FolderPath } from '../utils/types';
 import {
-  EMBHubAccountsUrl, EMBHubCreateFolderUrl,
-  EMBHubDeleteFolderUrl, EMBHubUploadFileUrl, EMBHubDeleteFileUrl,
-  EMBHubFolderContentsUrl, EMBHubRunAutomationUrl
+  EMBHubAccountsUrl, EMBHubFoldersUrl, EMBHubFilesUrl,
+  EMBHubRunAutomationUrl
 } from '../utils/network';
 
 const { Title, Text } = Typography;
@@ -97,10 +96,11 @@ const EMBHub: React.FC = () => {
     setFetching(true);
     try {
       const headers = getAuthToken() as AuthTokenType;
-      const response = await axios.post(EMBHubFolderContentsUrl, {
-        google_drive_email: email,
-        folder_id: currentFolderId
-      }, {
+      const response = await axios.get(EMBHubFoldersUrl, {
+        params: {
+          google_drive_email: email,
+          folder_id: currentFolderId
+        },
         headers: headers.headers
       });
       
@@ -140,7 +140,7 @@ const EMBHub: React.FC = () => {
     try {
       const [accountId, email] = selectedAccount.split(':');
       const headers = getAuthToken() as AuthTokenType;
-      const response = await axios.post(EMBHubCreateFolderUrl, {
+      const response = await axios.post(EMBHubFoldersUrl, {
         google_drive_email: email,
         name: newFolderName.trim(),
         parent_id: currentFolderId
@@ -181,7 +181,7 @@ const EMBHub: React.FC = () => {
       email: email,
       folderId: currentFolderId
     });
-    console.log('Making request to:', EMBHubUploadFileUrl);
+    console.log('Making request to:', EMBHubFilesUrl);
 
     setUploading(true);
     setUploadVisible(false);
@@ -190,7 +190,7 @@ const EMBHub: React.FC = () => {
       const headers = getAuthToken() as AuthTokenType;
       console.log('Request headers:', headers);
       
-      const response = await axios.post(EMBHubUploadFileUrl, formData, {
+      const response = await axios.post(EMBHubFilesUrl, formData, {
         headers: {
           ...headers.headers,
           // Let browser set Content-Type automatically with proper boundary
@@ -225,10 +225,11 @@ const EMBHub: React.FC = () => {
     try {
       const [accountId, email] = selectedAccount.split(':');
       const headers = getAuthToken() as AuthTokenType;
-      const response = await axios.post(EMBHubDeleteFileUrl, {
-        google_drive_email: email,
-        file_id: fileToDelete.id
-      }, {
+      const response = await axios.delete(EMBHubFilesUrl, {
+        params: {
+          google_drive_email: email,
+          file_id: fileToDelete.id
+        },
         headers: headers.headers
       });
       
@@ -368,13 +369,13 @@ const EMBHub: React.FC = () => {
     try {
       const headers = getAuthToken() as AuthTokenType;
       
-      const response = await axios.post(
-        EMBHubDeleteFolderUrl,
-        {
-          google_drive_email: email,
-          folder_id: folderToDelete.id
-        },
+      const response = await axios.delete(
+        EMBHubFoldersUrl,
         {
+          params: {
+            google_drive_email: email,
+            folder_id: folderToDelete.id
+          },
           headers: headers.headers
         }
       );
@@ -848,7 +848,7 @@ const PackingSlips: FC = () => {
       const authToken = getAuthToken() as AuthTokenType;
       
       // Create the URL for the PDF generation endpoint
-      const printUrl = `${PackingSlipsUrl}/${record.id}/print/`;
+      const printUrl = `${PackingSlipsUrl}/print/?ids=${record.id}`;
       
       // Create a temporary link to download the PDF
       const link = document.createElement('a');
@@ -928,8 +928,8 @@ const PackingSlips: FC = () => {
       const authToken = getAuthToken() as AuthTokenType;
       console.log('Auth token:', authToken);
       
-      // Create the URL for bulk PDF generation
-      const printUrl = `${PackingSlipsUrl}/bulk-print/`;
+      // Same endpoint as single print; POST so long selections fit
+      const printUrl = `${PackingSlipsUrl}/print/`;
       console.log('Print URL:', printUrl);
       
       // Send selected IDs to bulk print endpoint
@@ -940,7 +940,7 @@ const PackingSlips: FC = () => {
           'Content-Type': 'application/json',
         },
         body: JSON.stringify({
-          packing_slip_ids: selectedKeys
+          ids: selectedKeys
         }),
       });
       
@@ -23,11 +23,10 @@ export const GoogleDriveSettingsUrl = BaseUrl + "user/googledrive-settings"
 // EMB HUB Google Drive Management
 export const EMBHubAccountsUrl = BaseUrl + "masterdata/emb-hub/accounts/"
 export const EMBHubFolderTreeUrl = BaseUrl + "masterdata/emb-hub/tree/"
-export const EMBHubCreateFolderUrl = BaseUrl + "masterdata/emb-hub/folder/create/"
-export const EMBHubDeleteFolderUrl = BaseUrl + "masterdata/emb-hub/folder/delete/"
-export const EMBHubFolderContentsUrl = BaseUrl + "masterdata/emb-hub/folder/contents/"
-export const EMBHubUploadFileUrl = BaseUrl + "masterdata/emb-hub/file/upload/"
-export const EMBHubDeleteFileUrl = BaseUrl + "masterdata/emb-hub/file/delete/"
+// GET = contents, POST = create, DELETE = delete
+export const EMBHubFoldersUrl = BaseUrl + "masterdata/emb-hub/folders/"
+// POST = upload, DELETE = delete
+export const EMBHubFilesUrl = BaseUrl + "masterdata/emb-hub/files/"
 export const EMBHubSearchUrl = BaseUrl + "masterdata/emb-hub/search/"
 export const EMBHubRunAutomationUrl = BaseUrl + "masterdata/emb-hub/run-automation/"
 